@@ -25,15 +25,18 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE."""
 
-from .api import parse
+from .api import aparse, aparse_many, iterparse, parse, parse_many
 from .datetimes import registerDateHandler
 from .exceptions import (
     CharacterEncodingOverride,
     CharacterEncodingUnknown,
+    ContentTooLarge,
     FeedparserError,
     NonXMLContentType,
     UndeclaredNamespace,
 )
+from .profiles import ProfileCache
+from .sanitizer import SanitizerCache, SanitizerPolicy
 from .util import FeedParserDict
 
 # If you want feedparser to automatically resolve all relative URIs, set this
@@ -52,11 +55,19 @@ OPTIMISTIC_ENCODING_DETECTION = 1
 
 __all__ = (
     "parse",
+    "parse_many",
+    "iterparse",
+    "aparse",
+    "aparse_many",
     "registerDateHandler",
     "FeedParserDict",
+    "ProfileCache",
+    "SanitizerCache",
+    "SanitizerPolicy",
     "FeedparserError",
     "CharacterEncodingOverride",
     "CharacterEncodingUnknown",
+    "ContentTooLarge",
     "NonXMLContentType",
     "UndeclaredNamespace",
 )
@@ -26,20 +26,42 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
+import bz2
+import concurrent.futures
+import copyreg
+import datetime
+import functools
+import gzip
 import io
+import itertools
+import lzma
+import math
+import mmap
+import os
+import pickle
+import re
+import threading
+import time
+import typing
 import urllib.error
 import urllib.parse
 import xml.sax
+import zlib
 from typing import IO
 
+import requests
+
 from . import http
-from .encodings import MissingEncoding, convert_file_to_utf8
+from .encodings import MissingEncoding, StreamFactory, convert_file_to_utf8
+from .exceptions import ContentTooLarge, _EntryLimitReached
 from .html import BaseHTMLProcessor
 from .mixin import XMLParserMixin
 from .parsers.json import JSONParser
 from .parsers.loose import LooseXMLParser
 from .parsers.strict import StrictXMLParser
-from .sanitizer import replace_doctype
+from .profiles import ParseProfile, ProfileCache
+from .sanitizer import HTMLSanitizer, SanitizerCache, SanitizerPolicy, replace_doctype
 from .urls import make_safe_absolute_uri
 from .util import FeedParserDict
 
@@ -74,6 +96,12 @@ SUPPORTED_VERSIONS = {
 def _open_resource(
     url_file_stream_or_string,
     result,
+    *,
+    etag=None,
+    modified=None,
+    session=None,
+    timeout=None,
+    max_bytes=None,
 ):
     """URL, filename, or string --> stream
 
@@ -84,6 +112,7 @@ def _open_resource(
     Just .close() the object when you're done with it.
 
     :return: A seekable, readable file object.
+    :raises ContentTooLarge: if more than *max_bytes* would be read.
     """
 
     # Some notes on the history of the implementation of _open_resource().
@@ -100,11 +129,21 @@ def _open_resource(
     # the returned file is guaranteed to be seekable.
     # (If the underlying resource is not seekable,
     # the content is read and wrapped in a io.BytesIO/StringIO.)
+    #
+    # Compressed local files are decompressed on the fly;
+    # the stdlib decompressing files are seekable too
+    # (seeking backwards decompresses again from the start).
 
     if callable(getattr(url_file_stream_or_string, "read", None)):
         if callable(getattr(url_file_stream_or_string, "seekable", None)):
             if url_file_stream_or_string.seekable():
+                if max_bytes is not None:
+                    _check_remaining_size(url_file_stream_or_string, max_bytes)
                 return url_file_stream_or_string
+        if max_bytes is not None:
+            return _to_in_memory_file(
+                _read_limited(url_file_stream_or_string, max_bytes)
+            )
         return _to_in_memory_file(url_file_stream_or_string.read())
 
     looks_like_url = isinstance(
@@ -114,12 +153,19 @@ def _open_resource(
         "https",
     )
     if looks_like_url:
-        data = http.get(url_file_stream_or_string, result)
-        return io.BytesIO(data)
+        return http.get(
+            url_file_stream_or_string,
+            result,
+            etag=etag,
+            modified=modified,
+            session=session,
+            timeout=timeout,
+            max_bytes=max_bytes,
+        )
 
     # try to open with native open function (if url_file_stream_or_string is a filename)
     try:
-        return open(url_file_stream_or_string, "rb")
+        file = open(url_file_stream_or_string, "rb")
     except (OSError, TypeError, ValueError):
         # if url_file_stream_or_string is a str object that
         # cannot be converted to the encoding returned by
@@ -129,11 +175,213 @@ def _open_resource(
         # (such as an XML document encoded in UTF-32), TypeError will
         # be thrown.
         pass
+    else:
+        decompressed = _decompress_if_compressed(
+            file, url_file_stream_or_string, max_bytes
+        )
+        if decompressed is not file:
+            return decompressed
+        file = _map_if_large(file)
+        if max_bytes is not None:
+            try:
+                _check_remaining_size(file, max_bytes)
+            except ContentTooLarge:
+                file.close()
+                raise
+        return file
 
     # treat url_file_stream_or_string as bytes/string
+    if max_bytes is not None and len(url_file_stream_or_string) > max_bytes:
+        raise ContentTooLarge(f"content is larger than {max_bytes} bytes")
     return _to_in_memory_file(url_file_stream_or_string)
 
 
+# Local files at least this large are memory-mapped instead of read.
+MMAP_THRESHOLD = 2**24
+
+# Magic bytes of the compression formats that local files are sniffed for.
+_COMPRESSED_FILE_OPENERS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+
+def _decompress_if_compressed(file, path, max_bytes=None):
+    """Wrap a local file in a streaming decompressor if it is compressed.
+
+    The format is detected by magic bytes, not by file extension.
+    If the content only looks compressed, or doesn't decompress cleanly
+    (for example, because the file is truncated or corrupt),
+    *file* is returned unchanged, and its raw bytes are parsed.
+
+    To find out, the content is decompressed (and discarded) once.
+    If *max_bytes* is given, no more than *max_bytes* + 1 bytes are
+    decompressed, and ContentTooLarge is raised if there are more.
+    """
+
+    magic = file.read(6)
+    file.seek(0)
+    for prefix, opener in _COMPRESSED_FILE_OPENERS:
+        if not magic.startswith(prefix):
+            continue
+        decompressed = opener(path, "rb")
+        try:
+            too_large = not _decompresses_within(decompressed, max_bytes)
+            decompressed.seek(0)
+        except (OSError, EOFError, zlib.error, lzma.LZMAError):
+            decompressed.close()
+            return file
+        file.close()
+        if too_large:
+            decompressed.close()
+            raise ContentTooLarge(f"content is larger than {max_bytes} bytes")
+        return decompressed
+    return file
+
+
+def _decompresses_within(file, max_bytes):
+    """Read *file* to the end, unless it has more than *max_bytes*.
+
+    Return False if it has more. Seeking to the end would decompress
+    the whole file first, so the content is read in chunks and discarded.
+    """
+
+    remaining = math.inf if max_bytes is None else max_bytes + 1
+    while remaining > 0:
+        chunk = file.read(min(remaining, io.DEFAULT_BUFFER_SIZE))
+        if not chunk:
+            return True
+        remaining -= len(chunk)
+    return False
+
+
+def _map_if_large(file):
+    """Memory-map a local file that is at least MMAP_THRESHOLD bytes long.
+
+    Reading the same pages again (for the encoding validation pass,
+    for the strict parser, and for the loose parser if the strict one fails)
+    then needs neither system calls nor a second in-process buffer.
+    """
+
+    try:
+        size = os.fstat(file.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return file
+    if not size or size < MMAP_THRESHOLD:
+        return file
+    try:
+        mapped = _MappedFile(file)
+    except (OSError, ValueError):
+        return file
+    file.close()
+    return mapped
+
+
+class _MappedFile:
+    """A read-only, seekable binary file backed by a memory map.
+
+    Like io.BytesIO, getbuffer() gives access to the content without copying.
+    """
+
+    def __init__(self, file):
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read(self, size=-1):
+        if size is None:
+            size = -1
+        return self._map.read(size)
+
+    def readinto(self, buffer):
+        data = self._map.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def readline(self, size=-1):
+        if size is None or size < 0:
+            return self._map.readline()
+        start = self._map.tell()
+        end = self._map.find(b"\n", start, start + size)
+        end = start + size if end == -1 else end + 1
+        return self._map.read(end - start)
+
+    def readlines(self, hint=-1):
+        if hint is None or hint <= 0:
+            return list(self)
+        lines = []
+        total = 0
+        for line in self:
+            lines.append(line)
+            total += len(line)
+            if total >= hint:
+                break
+        return lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._map.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self._map.seek(offset, whence)
+        return self._map.tell()
+
+    def tell(self):
+        return self._map.tell()
+
+    def getbuffer(self):
+        return memoryview(self._map)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    @property
+    def closed(self):
+        return self._map.closed
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _check_remaining_size(file, max_bytes):
+    """Raise ContentTooLarge if a seekable file has more than *max_bytes* left."""
+
+    offset = file.tell()
+    size = file.seek(0, io.SEEK_END) - offset
+    file.seek(offset)
+    if size > max_bytes:
+        raise ContentTooLarge(f"content is larger than {max_bytes} bytes")
+
+
+def _read_limited(file, max_bytes):
+    """Read a non-seekable file, but no more than *max_bytes*."""
+
+    chunks = []
+    remaining = max_bytes + 1
+    while remaining > 0:
+        chunk = file.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    if remaining <= 0:
+        raise ContentTooLarge(f"content is larger than {max_bytes} bytes")
+    return chunks[0][:0].join(chunks) if chunks else b""
+
+
 def _to_in_memory_file(data):
     if isinstance(data, str):
         return io.StringIO(data)
@@ -154,6 +402,16 @@ def parse(
     resolve_relative_uris: bool | None = None,
     sanitize_html: bool | None = None,
     optimistic_encoding_detection: bool | None = None,
+    etag: str | None = None,
+    modified: str | datetime.datetime | time.struct_time | None = None,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    max_bytes: int | None = None,
+    max_entries: int | None = None,
+    fields: typing.Iterable[str] | None = None,
+    profiles: ProfileCache | None = None,
+    sanitizer_cache: SanitizerCache | None = None,
+    sanitizer_policy: SanitizerPolicy | None = None,
 ) -> FeedParserDict:
     """Parse a feed from a URL, file, stream, or string.
 
@@ -188,22 +446,76 @@ def parse(
         (uses less memory, but the wrong encoding may be detected in rare cases).
         Defaults to the value of
         :data:`feedparser.OPTIMISTIC_ENCODING_DETECTION`, which is ``True``.
+    :param etag:
+        The ``ETag`` returned the last time this URL was requested.
+        It is sent in the ``If-None-Match`` request header.
+    :param modified:
+        The ``Last-Modified`` value returned the last time this URL was requested,
+        as a string, a :class:`datetime.datetime`, or a 9-tuple in UTC.
+        It is sent in the ``If-Modified-Since`` request header.
+
+        If the server responds with ``304 Not Modified``, the result is returned
+        immediately with a ``status`` of 304 and no feed data.
+    :param session:
+        The :class:`requests.Session` (or any object with a compatible
+        ``get()`` method) used to request URLs. Defaults to a process-wide
+        session that keeps connections open; see
+        :func:`feedparser.http.get_session`.
+    :param timeout:
+        How long to wait for the server, in seconds, when requesting a URL.
+        Defaults to the value of :data:`feedparser.http.TIMEOUT`, which is 10.
+    :param max_bytes:
+        The maximum size of the feed, in bytes (or characters, for text).
+        This applies to URLs, files, and streams alike; for compressed
+        HTTP responses, it applies to the decompressed content.
+        If the feed is larger, nothing is parsed, and ``bozo_exception``
+        is set to :class:`feedparser.ContentTooLarge`.
+        Defaults to no limit.
+    :param max_entries:
+        The maximum number of entries to parse.
+        Parsing stops when entry number *max_entries* + 1 starts,
+        and ``truncated`` is set to ``True`` in the result if it does.
+        Anything after that point in the feed is not parsed at all
+        (including feed metadata that follows the entries).
+        Use 0 to parse only the feed metadata that precedes the first entry.
+        Negative values raise :class:`ValueError`.
+        Defaults to no limit.
+    :param fields:
+        The keys to compute for the feed and for each entry,
+        for example ``{"title", "link", "id", "published_parsed"}``.
+        Other keys are removed from ``feed`` and ``entries``, and the content
+        of elements that only produce such keys is not sanitized,
+        resolved, or parsed as a date in the first place.
+        Defaults to all keys.
+    :param profiles:
+        A :class:`feedparser.ProfileCache` that remembers how feeds requested
+        by URL were parsed, and uses that to parse them faster next time.
+        Defaults to no cache.
+    :param sanitizer_cache:
+        A :class:`feedparser.SanitizerCache` that remembers sanitized markup,
+        so that content which was already sanitized isn't sanitized again.
+        Defaults to no cache.
+    :param sanitizer_policy:
+        A :class:`feedparser.SanitizerPolicy` that decides which elements,
+        attributes, and styles are kept when HTML is sanitized.
+        Defaults to the allowlists of the sanitizer.
 
     """
 
-    result = FeedParserDict(
-        bozo=False,
-        entries=[],
-        feed=FeedParserDict(),
-        headers={},
-    )
+    _check_max_entries(max_entries)
+    result = _new_result()
 
     try:
         file = _open_resource(
             url_file_stream_or_string,
             result,
+            etag=etag,
+            modified=modified,
+            session=session,
+            timeout=timeout,
+            max_bytes=max_bytes,
         )
-    except urllib.error.URLError as error:
+    except (urllib.error.URLError, ContentTooLarge) as error:
         result.update(
             {
                 "bozo": True,
@@ -212,56 +524,463 @@ def parse(
         )
         return result
 
-    # at this point, the file is guaranteed to be seekable;
-    # we read 1 byte/character to see if it's empty and return early
-    # (this preserves the behavior in 6.0.8)
-    initial_file_offset = file.tell()
-    if not file.read(1):
-        return result
-    file.seek(initial_file_offset)
+    _parse_opened_resource(
+        file,
+        url_file_stream_or_string,
+        result,
+        response_headers,
+        resolve_relative_uris=resolve_relative_uris,
+        sanitize_html=sanitize_html,
+        optimistic_encoding_detection=optimistic_encoding_detection,
+        max_entries=max_entries,
+        fields=fields,
+        profiles=profiles,
+        sanitizer_cache=sanitizer_cache,
+        sanitizer_policy=sanitizer_policy,
+    )
+    return result
 
-    # overwrite existing headers using response_headers
-    result["headers"].update(response_headers or {})
+
+def iterparse(
+    url_file_stream_or_string,
+    response_headers: dict[str, str] | None = None,
+    resolve_relative_uris: bool | None = None,
+    sanitize_html: bool | None = None,
+    optimistic_encoding_detection: bool | None = None,
+    etag: str | None = None,
+    modified: str | datetime.datetime | time.struct_time | None = None,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    max_bytes: int | None = None,
+    fields: typing.Iterable[str] | None = None,
+    profiles: ProfileCache | None = None,
+    sanitizer_cache: SanitizerCache | None = None,
+    sanitizer_policy: SanitizerPolicy | None = None,
+) -> typing.Iterator[FeedParserDict]:
+    """Parse a feed incrementally, yielding each entry as soon as it is parsed.
+
+    This accepts the same arguments as :func:`parse`, except *max_entries*
+    (stop iterating instead; the rest of the feed is then not parsed).
+
+    The first item yielded is the result, like the one :func:`parse` returns,
+    but with an empty ``entries`` list. It is yielded as soon as the first
+    entry is parsed (or at the end, if there are no entries), so
+    ``feed`` contains the feed metadata that precedes the entries.
+    The result keeps being updated in place until the generator is exhausted;
+    for example, with feed metadata that follows the entries,
+    or with ``bozo`` if the feed turns out to be ill-formed.
+
+    Each entry is then yielded as soon as its end tag is parsed, and
+    the parser keeps no reference to it.
+    """
+
+    result = _new_result()
+
+    try:
+        file = _open_resource(
+            url_file_stream_or_string,
+            result,
+            etag=etag,
+            modified=modified,
+            session=session,
+            timeout=timeout,
+            max_bytes=max_bytes,
+        )
+    except (urllib.error.URLError, ContentTooLarge) as error:
+        result.update(
+            {
+                "bozo": True,
+                "bozo_exception": error,
+            }
+        )
+        yield result
+        return
 
     try:
-        _parse_file_inplace(
+        if not _has_content(file, result, response_headers):
+            yield result
+            return
+        yield from _iterparse_file(
             file,
             result,
             resolve_relative_uris=resolve_relative_uris,
             sanitize_html=sanitize_html,
             optimistic_encoding_detection=optimistic_encoding_detection,
+            fields=fields,
+            profiles=profiles,
+            sanitizer_cache=sanitizer_cache,
+            sanitizer_policy=sanitizer_policy,
         )
     finally:
         if not hasattr(url_file_stream_or_string, "read"):
             # the file does not come from the user, close it
             file.close()
 
-    return result
-
 
-def _parse_file_inplace(
-    file: IO[bytes] | IO[str],
-    result: dict,
-    *,
+async def aparse(
+    url_file_stream_or_string,
+    response_headers: dict[str, str] | None = None,
     resolve_relative_uris: bool | None = None,
     sanitize_html: bool | None = None,
     optimistic_encoding_detection: bool | None = None,
+    etag: str | None = None,
+    modified: str | datetime.datetime | time.struct_time | None = None,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    max_bytes: int | None = None,
+    max_entries: int | None = None,
+    fields: typing.Iterable[str] | None = None,
+    profiles: ProfileCache | None = None,
+    sanitizer_cache: SanitizerCache | None = None,
+    sanitizer_policy: SanitizerPolicy | None = None,
+    *,
+    executor: concurrent.futures.Executor | None = None,
+) -> FeedParserDict:
+    """Parse a feed without blocking the running event loop.
+
+    This accepts the same arguments as :func:`parse` and returns the same result.
+
+    Fetching the resource (which may be network or filesystem I/O)
+    runs in the event loop's default executor. Parsing is CPU-bound,
+    and runs in *executor*, which defaults to the event loop's default executor.
+    Because the result is filled in place, *executor* must share memory
+    with the caller; use a :class:`concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    _check_max_entries(max_entries)
+    loop = asyncio.get_running_loop()
+    result = _new_result()
+
+    try:
+        file = await loop.run_in_executor(
+            None,
+            functools.partial(
+                _open_resource,
+                url_file_stream_or_string,
+                result,
+                etag=etag,
+                modified=modified,
+                session=session,
+                timeout=timeout,
+                max_bytes=max_bytes,
+            ),
+        )
+    except (urllib.error.URLError, ContentTooLarge) as error:
+        result.update(
+            {
+                "bozo": True,
+                "bozo_exception": error,
+            }
+        )
+        return result
+
+    await loop.run_in_executor(
+        executor,
+        functools.partial(
+            _parse_opened_resource,
+            file,
+            url_file_stream_or_string,
+            result,
+            response_headers,
+            resolve_relative_uris=resolve_relative_uris,
+            sanitize_html=sanitize_html,
+            optimistic_encoding_detection=optimistic_encoding_detection,
+            max_entries=max_entries,
+            fields=fields,
+            profiles=profiles,
+            sanitizer_cache=sanitizer_cache,
+            sanitizer_policy=sanitizer_policy,
+        ),
+    )
+    return result
+
+
+async def aparse_many(
+    sources: typing.Iterable[typing.Any],
+    *,
+    limit: int = 10,
+    executor: concurrent.futures.Executor | None = None,
+    **kwargs: typing.Any,
+) -> typing.AsyncIterator[tuple[typing.Any, FeedParserDict]]:
+    """Parse many feeds concurrently, yielding results as they complete.
+
+    Each item in *sources* is passed to :func:`aparse`,
+    along with *executor* and any additional keyword arguments.
+    At most *limit* sources are fetched and parsed at the same time.
+
+    ``(source, result)`` tuples are yielded in completion order.
+    """
+
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    iterator = iter(sources)
+    # Only start *limit* tasks at a time, and start another one as each
+    # finishes, so that huge (or endless) iterables of sources
+    # are not consumed all at once.
+    pending: dict[asyncio.Task, typing.Any] = {}
+    try:
+        while True:
+            for source in itertools.islice(iterator, limit - len(pending)):
+                task = asyncio.ensure_future(
+                    aparse(source, executor=executor, **kwargs)
+                )
+                pending[task] = source
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                source = pending.pop(task)
+                yield source, task.result()
+    finally:
+        # If the caller stops iterating early, don't leave tasks running.
+        for task in pending:
+            task.cancel()
+
+
+def parse_many(
+    sources: typing.Iterable[typing.Any],
+    workers: int | None = None,
+    *,
+    chunksize: int = 1,
+    **kwargs: typing.Any,
+) -> typing.Iterator[tuple[typing.Any, FeedParserDict | Exception]]:
+    """Parse many feeds in a pool of worker processes.
+
+    Each item in *sources* may be a URL, a file path, or a byte or text string;
+    streams cannot be sent to other processes. Additional keyword arguments
+    are passed to :func:`parse` and must be picklable.
+
+    *workers* is the number of processes to start, and defaults to
+    the number of CPUs. Sources are sent to the workers in groups of
+    *chunksize*, which reduces overhead when parsing many small feeds.
+
+    ``(source, result)`` tuples are yielded as each group of sources finishes.
+    If parsing a source raises an exception, the exception is yielded
+    in place of its result, and the remaining sources are still parsed.
+    """
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    workers = workers or os.cpu_count() or 1
+    # Limit the number of pending chunks so that huge (or endless)
+    # iterables of sources are not consumed all at once.
+    max_pending = 2 * workers
+
+    iterator = iter(sources)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending: dict[concurrent.futures.Future, list[typing.Any]] = {}
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(itertools.islice(iterator, chunksize))
+                if not chunk:
+                    break
+                future = executor.submit(_parse_chunk, chunk, kwargs)
+                pending[future] = chunk
+            if not pending:
+                return
+
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    payloads = future.result()
+                except Exception as error:
+                    # The worker process itself failed.
+                    for source in chunk:
+                        yield source, error
+                    continue
+                for source, payload in zip(chunk, payloads):
+                    yield source, pickle.loads(payload)
+
+
+def _parse_chunk(
+    sources: list[typing.Any], kwargs: dict[str, typing.Any]
+) -> list[bytes]:
+    """Parse sources in a worker process and pickle each result separately.
+
+    Pickling each result here means that one result that cannot be pickled
+    affects only its own source, and not the entire chunk.
+    """
+
+    payloads = []
+    for source in sources:
+        try:
+            value: FeedParserDict | Exception = parse(source, **kwargs)
+        except Exception as error:
+            value = error
+        try:
+            payload = _dumps_result(value)
+        except Exception as error:
+            payload = _dumps_result(error)
+        payloads.append(payload)
+    return payloads
+
+
+class _FrozenLocator(xml.sax.xmlreader.Locator):
+    def __init__(self, system_id, public_id, line_number, column_number):
+        self._system_id = system_id
+        self._public_id = public_id
+        self._line_number = line_number
+        self._column_number = column_number
+
+    def getColumnNumber(self):
+        return self._column_number
+
+    def getLineNumber(self):
+        return self._line_number
+
+    def getPublicId(self):
+        return self._public_id
+
+    def getSystemId(self):
+        return self._system_id
+
+
+def _load_sax_parse_exception(msg, exception, locator):
+    return xml.sax.SAXParseException(msg, exception, locator)
+
+
+def _reduce_sax_parse_exception(error):
+    # SAXParseException keeps a reference to the live parser's locator,
+    # and cannot be re-created from its args alone.
+    locator = _FrozenLocator(
+        error.getSystemId(),
+        error.getPublicId(),
+        error.getLineNumber(),
+        error.getColumnNumber(),
+    )
+    return _load_sax_parse_exception, (error.getMessage(), None, locator)
+
+
+def _dumps_result(value: FeedParserDict | Exception) -> bytes:
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    pickler.dispatch_table[xml.sax.SAXParseException] = _reduce_sax_parse_exception
+    pickler.dump(value)
+    return buffer.getvalue()
+
+
+def _check_max_entries(max_entries: int | None) -> None:
+    if max_entries is not None and max_entries < 0:
+        raise ValueError("max_entries must be at least 0")
+
+
+def _new_result() -> FeedParserDict:
+    return FeedParserDict(
+        bozo=False,
+        entries=[],
+        feed=FeedParserDict(),
+        headers={},
+    )
+
+
+def _parse_opened_resource(
+    file: IO[bytes] | IO[str],
+    url_file_stream_or_string,
+    result: FeedParserDict,
+    response_headers: dict[str, str] | None,
+    **kwargs: typing.Any,
 ) -> None:
-    # Avoid a cyclic import.
-    import feedparser
+    """Parse a file returned by _open_resource() into *result*.
 
-    if sanitize_html is None:
-        sanitize_html = bool(feedparser.SANITIZE_HTML)
-    if resolve_relative_uris is None:
-        resolve_relative_uris = bool(feedparser.RESOLVE_RELATIVE_URIS)
-    if optimistic_encoding_detection is None:
-        optimistic_encoding_detection = bool(feedparser.OPTIMISTIC_ENCODING_DETECTION)
+    The file is closed afterwards unless it was passed in by the caller.
+    """
+
+    try:
+        if _has_content(file, result, response_headers):
+            _parse_file_inplace(file, result, **kwargs)
+    finally:
+        if not hasattr(url_file_stream_or_string, "read"):
+            # the file does not come from the user, close it
+            file.close()
+
+
+def _has_content(
+    file: IO[bytes] | IO[str],
+    result: FeedParserDict,
+    response_headers: dict[str, str] | None,
+) -> bool:
+    """Check whether there is anything to parse in an opened resource.
+
+    If there is, merge *response_headers* into the result headers.
+    """
+
+    # The server indicated that the feed has not changed since the
+    # etag/modified values were returned. There is nothing to parse.
+    if result.get("status") == 304:
+        result["debug_message"] = (
+            "The feed has not changed since you last checked, "
+            "so the server sent no data.  This is a feature, not a bug!"
+        )
+        return False
+
+    # at this point, the file is guaranteed to be seekable;
+    # we read 1 byte/character to see if it's empty and return early
+    # (this preserves the behavior in 6.0.8)
+    initial_file_offset = file.tell()
+    if not file.read(1):
+        return False
+    file.seek(initial_file_offset)
+
+    # overwrite existing headers using response_headers
+    result["headers"].update(response_headers or {})
+    return True
+
+
+def _expand_fields(fields):
+    """Add the keys that the requested *fields* are aliases of or derived from."""
+
+    expanded = set()
+    for field in fields:
+        expanded.add(field)
+        realkey = FeedParserDict.keymap.get(field, field)
+        if isinstance(realkey, list):
+            expanded.update(realkey)
+        else:
+            expanded.add(realkey)
+    # FeedParserDict falls back from updated to published (see issue 310).
+    if "updated" in expanded:
+        expanded.add("published")
+    if "updated_parsed" in expanded:
+        expanded.add("published_parsed")
+    # These are computed from other keys when they are looked up.
+    if "category" in expanded:
+        expanded.add("tags")
+    if "enclosures" in expanded or "license" in expanded:
+        expanded.add("links")
+    return frozenset(expanded)
+
+
+def _project(context, fields):
+    for key in list(context):
+        if key not in fields:
+            del context[key]
+
+
+def _prepare_stream(
+    file, result, optimistic_encoding_detection, profile=None, validate=True
+):
+    """Detect the encoding and the feed type of an opened resource.
+
+    Returns the stream factory to read the feed from, the entities
+    declared in its doctype, its base URI and language, and whether
+    the strict XML parser and the JSON parser should be used.
+    """
 
     stream_factory = convert_file_to_utf8(
-        result["headers"], file, result, optimistic_encoding_detection
+        result["headers"],
+        file,
+        result,
+        optimistic_encoding_detection,
+        encoding_hint=profile and profile.encoding,
+        validate=validate,
     )
-    # We're done with file, all access must happen through stream_factory.
-    del file
 
     # Some notes about the stream_factory.get_{text,binary}_file() methods:
     #
@@ -298,60 +1017,383 @@ def _parse_file_inplace(
     if not _XML_AVAILABLE:
         use_strict_parser = False
 
+    return (
+        stream_factory,
+        entities,
+        baseuri,
+        baselang,
+        use_strict_parser,
+        use_json_parser,
+    )
+
+
+def _make_sax_parser(feed_parser):
+    saxparser = xml.sax.make_parser(PREFERRED_XML_PARSERS)
+    saxparser.setFeature(xml.sax.handler.feature_namespaces, 1)
+    try:
+        # Disable downloading external doctype references, if possible.
+        saxparser.setFeature(xml.sax.handler.feature_external_ges, 0)
+    except xml.sax.SAXNotSupportedException:
+        pass
+    saxparser.setContentHandler(feed_parser)
+    saxparser.setErrorHandler(feed_parser)  # type: ignore[arg-type]
+    return saxparser
+
+
+# How many idle SAX readers, with their content handlers, each thread keeps.
+SAX_PARSER_POOL_SIZE = 4
+
+
+class _SAXParserPool(threading.local):
+    def __init__(self):
+        self.idle = []
+
+
+_sax_parser_pool = _SAXParserPool()
+
+
+def _acquire_sax_parser(
+    baseuri: str, baselang: str | None
+) -> tuple[xml.sax.xmlreader.IncrementalParser, StrictFeedParser]:
+    """Return a SAX reader and the StrictFeedParser that handles its events.
+
+    Finding and configuring a SAX driver costs more than parsing a small
+    feed, so readers are reused from a per-thread pool when possible.
+    """
+
+    drivers = tuple(PREFERRED_XML_PARSERS)
+    idle = _sax_parser_pool.idle
+    while idle:
+        saxparser, feed_parser, pooled_drivers = idle.pop()
+        if pooled_drivers == drivers:
+            feed_parser.reset(baseuri, baselang, "utf-8")
+            return saxparser, feed_parser
+    feed_parser = StrictFeedParser(baseuri, baselang, "utf-8")
+    return _make_sax_parser(feed_parser), feed_parser
+
+
+def _release_sax_parser(saxparser, feed_parser):
+    """Return a SAX reader that finished reading a document to the pool."""
+
+    # Don't keep the last document's results alive while the reader is idle.
+    feed_parser.reset()
+    idle = _sax_parser_pool.idle
+    if len(idle) < SAX_PARSER_POOL_SIZE:
+        idle.append((saxparser, feed_parser, tuple(PREFERRED_XML_PARSERS)))
+
+
+# The modules of the SAX drivers whose positions come straight from Expat.
+_EXPAT_DRIVERS = ("xml.sax.expatreader", "feedparser.parsers.expat")
+
+
+def _resume_positions(feed_parser, saxparser):
+    """Find where the loose parser can pick up after the strict parser failed.
+
+    The loose parser reads the text before the first entry, to learn about
+    the feed, and then skips ahead to the last entry that the strict parser
+    started, since that entry may be incomplete. The entries before it are
+    kept as they are.
+
+    Returns None if no entry was completed before the failure, or if the
+    positions that the SAX driver reports can't be relied upon.
+    """
+
+    if feed_parser.entries_started < 2:
+        return None
+    # Expat counts columns in characters, which is what the text stream
+    # that the loose parser reads is made of.
+    if type(saxparser).__module__ not in _EXPAT_DRIVERS:
+        return None
+    return feed_parser.first_entry_position, feed_parser.last_entry_position
+
+
+def _salvage_entries(strict_parser, loose_parser, entries_released=0):
+    """Hand the entries that the strict parser completed to the loose parser.
+
+    *entries_released* is the number of entries that were already removed
+    from the strict parser. Returns the number of entries that the loose
+    parser will parse again, because they were already released.
+    """
+
+    kept = strict_parser.entries_started - 1
+    loose_parser.entries = strict_parser.entries[: max(0, kept - entries_released)]
+    return max(0, entries_released - kept)
+
+
+def _merge_salvaged_feed(strict_parser, loose_parser):
+    # The loose parser skipped whatever the strict parser found
+    # between the first entry and the entry where parsing resumed.
+    feeddata = loose_parser.feeddata
+    for key, value in strict_parser.feeddata.items():
+        loose_value = feeddata.get(key)
+        if isinstance(value, list) and isinstance(loose_value, list):
+            # Lists such as tags and links gather elements from the whole feed;
+            # the ones that the strict parser found come first in the feed.
+            feeddata[key] = value + [item for item in loose_value if item not in value]
+        else:
+            feeddata.setdefault(key, value)
+    for prefix, uri in strict_parser.namespaces_in_use.items():
+        loose_parser.namespaces_in_use.setdefault(prefix, uri)
+
+
+def _lookup_profile(profiles, result):
+    href = result.get("href")
+    if profiles is None or not href:
+        return None
+    return profiles.get(href)
+
+
+def _learn_profile(profiles, result):
+    """Remember in *profiles* what was detected while parsing the feed."""
+
+    href = result.get("href")
+    if profiles is None or not href:
+        return
+    profiles.put(href, ParseProfile(result.get("encoding") or None))
+
+
+_LINE_BREAK = re.compile(r"\r\n?|\n")
+
+
+def _read_text(stream, size, skip=None):
+    """Read *stream* in chunks of at most *size* characters.
+
+    If *skip* is given, it is a pair of positions, and the text between
+    them is left out. Positions are (line, column) pairs as reported by
+    expat: lines are counted from 1, columns are counted from 0, and
+    "\\r\\n", "\\r", and "\\n" each end a line.
+    """
+
+    positions = list(skip or ())
+    skipping = False
+    line = 1
+    # The offset of the current line in *text*; negative if it began
+    # in a previous chunk.
+    line_start = 0
+    pending = ""
+    while True:
+        chunk = stream.read(size)
+        text = pending + chunk
+        pending = ""
+        if positions and chunk and text.endswith("\r"):
+            # This may be the first half of a "\r\n" line break.
+            pending, text = "\r", text[:-1]
+        start = scan = 0
+        while positions:
+            target_line, target_column = positions[0]
+            if line < target_line:
+                match = _LINE_BREAK.search(text, scan)
+                if match is None:
+                    break
+                line += 1
+                line_start = scan = match.end()
+                continue
+            offset = line_start + target_column
+            if offset > len(text):
+                break
+            if not skipping and offset > start:
+                yield text[start:offset]
+            start = offset
+            skipping = not skipping
+            positions.pop(0)
+        if not skipping and start < len(text):
+            yield text[start:]
+        line_start -= len(text)
+        if not chunk:
+            break
+
+
+# How much text is fed to the loose parser at a time.
+LOOSE_CHUNK_SIZE = 2**16
+
+
+def _parse_file_inplace(
+    file: IO[bytes] | IO[str],
+    result: dict,
+    *,
+    resolve_relative_uris: bool | None = None,
+    sanitize_html: bool | None = None,
+    optimistic_encoding_detection: bool | None = None,
+    max_entries: int | None = None,
+    fields: typing.Iterable[str] | None = None,
+    profiles: ProfileCache | None = None,
+    sanitizer_cache: SanitizerCache | None = None,
+    sanitizer_policy: SanitizerPolicy | None = None,
+) -> None:
+    # Avoid a cyclic import.
+    import feedparser
+
+    if sanitize_html is None:
+        sanitize_html = bool(feedparser.SANITIZE_HTML)
+    if resolve_relative_uris is None:
+        resolve_relative_uris = bool(feedparser.RESOLVE_RELATIVE_URIS)
+    if optimistic_encoding_detection is None:
+        optimistic_encoding_detection = bool(feedparser.OPTIMISTIC_ENCODING_DETECTION)
+    if fields is not None:
+        fields = _expand_fields(fields)
+    if sanitize_html and sanitizer_policy is None:
+        # Compare the HTMLSanitizer allowlists once per feed,
+        # not for every element that is sanitized.
+        sanitizer_policy = HTMLSanitizer._default_policy()
+    options = {
+        "resolve_relative_uris": resolve_relative_uris,
+        "sanitize_html": sanitize_html,
+        "max_entries": max_entries,
+        "fields": fields,
+        "profiles": profiles,
+        "sanitizer_cache": sanitizer_cache,
+        "sanitizer_policy": sanitizer_policy,
+        "profile": _lookup_profile(profiles, result),
+    }
+
+    if optimistic_encoding_detection:
+        # Whether the encoding detected from the prefix works for the entire
+        # file is found out while parsing it, instead of decoding it twice.
+        # In the rare case it doesn't, start over and detect the encoding
+        # from the entire file.
+        start = file.tell()
+        initial_result = dict(result)
+        try:
+            _parse_decoded_file(file, result, validated=False, **options)
+        except UnicodeDecodeError:
+            file.seek(start)
+            result.clear()
+            result.update(initial_result)
+        else:
+            return
+
+    _parse_decoded_file(file, result, validated=True, **options)
+
+
+class _ParserSettings(typing.NamedTuple):
+    """The options that parse() and iterparse() pass on to every feed parser."""
+
+    resolve_relative_uris: bool
+    sanitize_html: bool
+    max_entries: int | None
+    fields: frozenset[str] | None
+    sanitizer_cache: SanitizerCache | None
+    sanitizer_policy: SanitizerPolicy | None
+
+    def apply(self, feed_parser):
+        if not isinstance(feed_parser, JSONParser):
+            feed_parser.resolve_relative_uris = self.resolve_relative_uris
+            feed_parser.sanitize_html = self.sanitize_html
+        feed_parser.max_entries = self.max_entries
+        feed_parser.fields = self.fields
+        feed_parser.sanitizer_cache = self.sanitizer_cache
+        feed_parser.sanitizer_policy = self.sanitizer_policy
+
+
+def _start_strict_parser(
+    stream_factory: StreamFactory,
+    baseuri: str,
+    baselang: str | None,
+    settings: _ParserSettings,
+) -> tuple[xml.sax.xmlreader.IncrementalParser, StrictFeedParser, typing.Any]:
+    """Return a configured SAX reader, its StrictFeedParser, and the stream to read.
+
+    If an encoding was detected, the stream decodes the file on the fly;
+    otherwise, it is binary and the SAX parser deals with it.
+    """
+
+    saxparser, feed_parser = _acquire_sax_parser(baseuri, baselang)
+    settings.apply(feed_parser)
+    try:
+        stream = stream_factory.get_text_file()
+    except MissingEncoding:
+        stream = stream_factory.get_binary_file()
+    return saxparser, feed_parser, stream
+
+
+def _parse_decoded_file(
+    file: IO[bytes] | IO[str],
+    result: dict,
+    *,
+    validated: bool,
+    resolve_relative_uris: bool,
+    sanitize_html: bool,
+    max_entries: int | None,
+    fields: frozenset[str] | None,
+    profiles: ProfileCache | None,
+    profile: ParseProfile | None,
+    sanitizer_cache: SanitizerCache | None,
+    sanitizer_policy: SanitizerPolicy | None,
+) -> None:
+    """Detect the encoding of *file* and parse it into *result*.
+
+    If *validated* is false, the encoding is detected from a prefix of
+    the file, and UnicodeDecodeError is raised if the rest of the file
+    cannot be decoded with it.
+    """
+
+    (
+        stream_factory,
+        entities,
+        baseuri,
+        baselang,
+        use_strict_parser,
+        use_json_parser,
+    ) = _prepare_stream(file, result, not validated, profile, validate=validated)
+    # We're done with file, all access must happen through stream_factory.
+    del file
+
     feed_parser: JSONParser | StrictFeedParser | LooseFeedParser
+    truncated = False
+    resume_positions = None
+    settings = _ParserSettings(
+        resolve_relative_uris,
+        sanitize_html,
+        max_entries,
+        fields,
+        sanitizer_cache,
+        sanitizer_policy,
+    )
 
     if use_strict_parser and not use_json_parser:
-        # Initialize the SAX parser.
-        feed_parser = StrictFeedParser(baseuri, baselang, "utf-8")
-        feed_parser.resolve_relative_uris = resolve_relative_uris
-        feed_parser.sanitize_html = sanitize_html
-        saxparser = xml.sax.make_parser(PREFERRED_XML_PARSERS)
-        saxparser.setFeature(xml.sax.handler.feature_namespaces, 1)
-        try:
-            # Disable downloading external doctype references, if possible.
-            saxparser.setFeature(xml.sax.handler.feature_external_ges, 0)
-        except xml.sax.SAXNotSupportedException:
-            pass
-        saxparser.setContentHandler(feed_parser)
-        saxparser.setErrorHandler(feed_parser)  # type: ignore[arg-type]
+        saxparser, feed_parser, stream = _start_strict_parser(
+            stream_factory, baseuri, baselang, settings
+        )
         source = xml.sax.xmlreader.InputSource()
-
-        # If an encoding was detected, decode the file on the fly;
-        # otherwise, pass it as-is and let the SAX parser deal with it.
-        try:
-            source.setCharacterStream(stream_factory.get_text_file())
-        except MissingEncoding:
-            source.setByteStream(stream_factory.get_binary_file())
+        if isinstance(stream.read(0), str):
+            source.setCharacterStream(stream)
+        else:
+            source.setByteStream(stream)
 
         try:
             saxparser.parse(source)
+        except _EntryLimitReached:
+            # The rest of the document is deliberately left unparsed.
+            truncated = True
         except xml.sax.SAXException as e:
             result["bozo"] = 1
             result["bozo_exception"] = feed_parser.exc or e
             use_strict_parser = False
+            if source.getCharacterStream() is not None:
+                resume_positions = _resume_positions(feed_parser, saxparser)
 
     # The loose XML parser will be tried if the strict XML parser was not used
     # (or if it failed to parse the feed).
     if not use_strict_parser and not use_json_parser:
+        strict_parser = feed_parser if resume_positions else None
         feed_parser = LooseFeedParser(baseuri, baselang, "utf-8", entities)
-        feed_parser.resolve_relative_uris = resolve_relative_uris
-        feed_parser.sanitize_html = sanitize_html
+        settings.apply(feed_parser)
+        if strict_parser is not None:
+            _salvage_entries(strict_parser, feed_parser)
 
         # If an encoding was detected, use it; otherwise, assume utf-8 and do your best.
         # Will raise io.UnsupportedOperation if the underlying file is not seekable.
-        data = stream_factory.get_text_file("utf-8", "replace").read()
-
-        # As of 6.0.8, LooseFeedParser.feed() can be called exactly once
-        # with the entire data (it does some re.sub() and str.replace() on it).
-        #
-        # SGMLParser (of which LooseFeedParser is a subclass)
-        # *can* be fed in a streaming fashion,
-        # by calling feed() repeatedly with chunks of text.
-        #
-        # When/if LooseFeedParser will support being fed chunks,
-        # replace the read() call above with read(size)/feed() calls in a loop.
+        errors = "strict" if stream_factory.encoding and not validated else "replace"
+        stream = stream_factory.get_text_file("utf-8", errors)
 
-        feed_parser.feed(data)
+        try:
+            for chunk in _read_text(stream, LOOSE_CHUNK_SIZE, resume_positions):
+                feed_parser.feed_chunk(chunk)
+            feed_parser.close()
+        except _EntryLimitReached:
+            truncated = True
+        if strict_parser is not None:
+            _merge_salvaged_feed(strict_parser, feed_parser)
 
         # If parsing with the loose XML parser resulted in no information,
         # flag that the JSON parser should be tried.
@@ -361,16 +1403,213 @@ def _parse_file_inplace(
     if use_json_parser:
         result["version"] = None
         feed_parser = JSONParser(baseuri, baselang, "utf-8")
+        settings.apply(feed_parser)
         try:
             feed_parser.feed(stream_factory.get_file())
         except Exception as e:
+            if isinstance(e, UnicodeDecodeError) and not validated:
+                raise
             result["bozo"] = 1
             result["bozo_exception"] = e
+        truncated = feed_parser.truncated
 
     result["feed"] = feed_parser.feeddata
     result["entries"] = feed_parser.entries
+    if max_entries is not None:
+        result["truncated"] = truncated
+    if fields is not None:
+        _project(result["feed"], fields)
+        for entry in result["entries"]:
+            _project(entry, fields)
     result["version"] = result["version"] or feed_parser.version
     if isinstance(feed_parser, JSONParser):
         result["namespaces"] = {}
     else:
         result["namespaces"] = feed_parser.namespaces_in_use
+    _learn_profile(profiles, result)
+    # A reader that stopped partway through a document isn't reused.
+    if isinstance(feed_parser, StrictFeedParser) and not truncated:
+        _release_sax_parser(saxparser, feed_parser)
+
+
+# How much text iterparse() feeds to the parser between looking for entries.
+ITERPARSE_CHUNK_SIZE = 2**14
+
+
+def _iterparse_file(
+    file: IO[bytes] | IO[str],
+    result: FeedParserDict,
+    *,
+    resolve_relative_uris: bool | None = None,
+    sanitize_html: bool | None = None,
+    optimistic_encoding_detection: bool | None = None,
+    fields: typing.Iterable[str] | None = None,
+    profiles: ProfileCache | None = None,
+    sanitizer_cache: SanitizerCache | None = None,
+    sanitizer_policy: SanitizerPolicy | None = None,
+) -> typing.Iterator[FeedParserDict]:
+    """Like _parse_file_inplace(), but yield *result* and then each entry."""
+
+    # Avoid a cyclic import.
+    import feedparser
+
+    if sanitize_html is None:
+        sanitize_html = bool(feedparser.SANITIZE_HTML)
+    if resolve_relative_uris is None:
+        resolve_relative_uris = bool(feedparser.RESOLVE_RELATIVE_URIS)
+    if optimistic_encoding_detection is None:
+        optimistic_encoding_detection = bool(feedparser.OPTIMISTIC_ENCODING_DETECTION)
+    expanded_fields = None if fields is None else _expand_fields(fields)
+    if sanitize_html and sanitizer_policy is None:
+        # Compare the HTMLSanitizer allowlists once per feed,
+        # not for every element that is sanitized.
+        sanitizer_policy = HTMLSanitizer._default_policy()
+    profile = _lookup_profile(profiles, result)
+
+    (
+        stream_factory,
+        entities,
+        baseuri,
+        baselang,
+        use_strict_parser,
+        use_json_parser,
+    ) = _prepare_stream(file, result, optimistic_encoding_detection, profile)
+    del file
+
+    feed_parser: JSONParser | StrictFeedParser | LooseFeedParser
+    result_yielded = False
+    entries_yielded = 0
+    entries_to_skip = 0
+    resume_positions = None
+    settings = _ParserSettings(
+        resolve_relative_uris,
+        sanitize_html,
+        None,
+        expanded_fields,
+        sanitizer_cache,
+        sanitizer_policy,
+    )
+
+    def publish(feed_parser):
+        # Point the result at the feed metadata the parser is filling in.
+        if result_yielded:
+            feed = result["feed"]
+            if feed is not feed_parser.feeddata:
+                feed.clear()
+                feed.update(feed_parser.feeddata)
+                feed_parser.feeddata = feed
+        else:
+            result["feed"] = feed_parser.feeddata
+        result["version"] = result["version"] or feed_parser.version
+        if isinstance(feed_parser, JSONParser):
+            result["namespaces"] = {}
+        else:
+            result["namespaces"] = feed_parser.namespaces_in_use
+
+    if use_strict_parser and not use_json_parser:
+        saxparser, feed_parser, stream = _start_strict_parser(
+            stream_factory, baseuri, baselang, settings
+        )
+
+        try:
+            while True:
+                chunk = stream.read(ITERPARSE_CHUNK_SIZE)
+                if chunk:
+                    saxparser.feed(chunk)
+                else:
+                    saxparser.close()
+                for entry in _release_completed_entries(feed_parser):
+                    if not result_yielded:
+                        publish(feed_parser)
+                        yield result
+                        result_yielded = True
+                    if expanded_fields is not None:
+                        _project(entry, expanded_fields)
+                    yield entry
+                    entries_yielded += 1
+                if not chunk:
+                    break
+        except xml.sax.SAXException as e:
+            result["bozo"] = 1
+            result["bozo_exception"] = feed_parser.exc or e
+            use_strict_parser = False
+            if isinstance(stream.read(0), str):
+                resume_positions = _resume_positions(feed_parser, saxparser)
+
+    # The loose XML parser will be tried if the strict XML parser was not used
+    # (or if it failed to parse the feed). Entries that were already yielded
+    # are skipped.
+    if not use_strict_parser and not use_json_parser:
+        strict_parser = feed_parser if resume_positions else None
+        entries_to_skip = entries_yielded
+        feed_parser = LooseFeedParser(baseuri, baselang, "utf-8", entities)
+        settings.apply(feed_parser)
+        if strict_parser is not None:
+            entries_to_skip = _salvage_entries(
+                strict_parser, feed_parser, entries_yielded
+            )
+
+        stream = stream_factory.get_text_file("utf-8", "replace")
+        chunks = _read_text(stream, ITERPARSE_CHUNK_SIZE, resume_positions)
+        for chunk in itertools.chain(chunks, [""]):
+            if chunk:
+                feed_parser.feed_chunk(chunk)
+            else:
+                feed_parser.close()
+            for entry in _release_completed_entries(feed_parser):
+                if entries_to_skip:
+                    entries_to_skip -= 1
+                    continue
+                if not result_yielded:
+                    publish(feed_parser)
+                    yield result
+                    result_yielded = True
+                if expanded_fields is not None:
+                    _project(entry, expanded_fields)
+                yield entry
+                entries_yielded += 1
+        if strict_parser is not None:
+            _merge_salvaged_feed(strict_parser, feed_parser)
+
+        # If parsing with the loose XML parser resulted in no information,
+        # flag that the JSON parser should be tried.
+        if not (feed_parser.entries or feed_parser.feeddata or feed_parser.version):
+            use_json_parser = True
+
+    if use_json_parser:
+        entries_to_skip = entries_yielded
+        result["version"] = None
+        feed_parser = JSONParser(baseuri, baselang, "utf-8")
+        settings.apply(feed_parser)
+        try:
+            feed_parser.feed(stream_factory.get_file())
+        except Exception as e:
+            result["bozo"] = 1
+            result["bozo_exception"] = e
+
+    publish(feed_parser)
+    if expanded_fields is not None:
+        _project(result["feed"], expanded_fields)
+    _learn_profile(profiles, result)
+    if not result_yielded:
+        yield result
+    # The document is over; entries that were never closed are complete too.
+    entries = _release_completed_entries(feed_parser, final=True)
+    for entry in itertools.islice(entries, entries_to_skip, None):
+        if expanded_fields is not None:
+            _project(entry, expanded_fields)
+        yield entry
+    if isinstance(feed_parser, StrictFeedParser):
+        _release_sax_parser(saxparser, feed_parser)
+
+
+def _release_completed_entries(feed_parser, final=False):
+    """Remove the completely parsed entries from the parser state, one by one."""
+
+    # The entry that is being parsed must stay, since the parser refers to it.
+    keep = 1 if not final and getattr(feed_parser, "inentry", 0) else 0
+    property_depth_map = getattr(feed_parser, "property_depth_map", {})
+    while len(feed_parser.entries) > keep:
+        entry = feed_parser.entries.pop(0)
+        property_depth_map.pop(entry, None)
+        yield entry
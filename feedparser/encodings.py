@@ -40,11 +40,21 @@ try:
         import chardet  # type: ignore[no-redef]
 except ImportError:
     lazy_chardet_encoding = None
+    lazy_chardet_file_encoding = None
 else:
 
     def lazy_chardet_encoding(data):
         return chardet.detect(data)["encoding"] or ""
 
+    def lazy_chardet_file_encoding(file):
+        detector = chardet.UniversalDetector()
+        while not detector.done:
+            chunk = file.read(CONVERT_FILE_TEST_CHUNK_LEN)
+            if not chunk:
+                break
+            detector.feed(chunk)
+        return detector.close()["encoding"] or ""
+
 
 from .exceptions import (
     CharacterEncodingOverride,
@@ -97,9 +107,17 @@ def parse_content_type(line: str) -> tuple[str, str]:
 
 
 def convert_to_utf8(
-    http_headers: dict[str, str], data: bytes, result: dict[str, typing.Any]
+    http_headers: dict[str, str],
+    data: bytes,
+    result: dict[str, typing.Any],
+    *,
+    encoding_hint: str | None = None,
 ) -> bytes:
-    """Detect and convert the character encoding to UTF-8."""
+    """Detect and convert the character encoding to UTF-8.
+
+    *encoding_hint* is an encoding that worked for this feed before.
+    It is tried before guessing the encoding from the data with chardet.
+    """
 
     # This is so much trickier than it sounds, it's not even funny.
     # According to RFC 3023 ('XML Media Types'), if the HTTP Content-Type
@@ -140,7 +158,51 @@ def convert_to_utf8(
     # feed in the declared character encoding (assuming it was declared
     # correctly, which many are not).
 
+    sniffed = _sniff_encoding(http_headers, data)
+    data = data[sniffed.bom_length :]
+
+    def detect():
+        if lazy_chardet_encoding is None:
+            return None
+        return lazy_chardet_encoding(data)
+
+    for proposed_encoding in _encoding_candidates(sniffed, encoding_hint, detect):
+        try:
+            text = data.decode(proposed_encoding)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        if not sniffed.json:
+            text = _replace_xml_declaration(text)
+        data = text.encode("utf-8")
+        break
+    else:
+        proposed_encoding = None
+
+    _set_detected_encoding(result, sniffed, proposed_encoding)
+    return data
+
+
+class _SniffedEncoding(typing.NamedTuple):
+    bom_length: int
+    http_content_type: str
+    json: bool
+    # there are four encodings to keep track of:
+    # - http_encoding is the encoding declared in the Content-Type HTTP header
+    # - xml_encoding is the encoding declared in the <?xml declaration
+    # - bom_encoding is the encoding sniffed from the first 4 bytes of the XML data
+    # - rfc3023_encoding is the actual encoding, as per RFC 3023
+    #   and a variety of other conflicting specifications
+    rfc3023_encoding: str
+    xml_encoding: str
+    bom_encoding: str
+    error: FeedparserError | None
+
+
+def _sniff_encoding(http_headers: dict[str, str], data: bytes) -> _SniffedEncoding:
+    """Find the encodings declared for *data*, which may be just its prefix."""
+
     bom_encoding = ""
+    bom_length = 0
     xml_encoding = ""
 
     # Look at the first few bytes of the document to guess what
@@ -152,19 +214,19 @@ def convert_to_utf8(
     # Check for BOMs first.
     if data[:4] == codecs.BOM_UTF32_BE:
         bom_encoding = "utf-32be"
-        data = data[4:]
+        bom_length = 4
     elif data[:4] == codecs.BOM_UTF32_LE:
         bom_encoding = "utf-32le"
-        data = data[4:]
+        bom_length = 4
     elif data[:2] == codecs.BOM_UTF16_BE and data[2:4] != ZERO_BYTES:
         bom_encoding = "utf-16be"
-        data = data[2:]
+        bom_length = 2
     elif data[:2] == codecs.BOM_UTF16_LE and data[2:4] != ZERO_BYTES:
         bom_encoding = "utf-16le"
-        data = data[2:]
+        bom_length = 2
     elif data[:3] == codecs.BOM_UTF8:
         bom_encoding = "utf-8"
-        data = data[3:]
+        bom_length = 3
     # Check for the characters '<?xm' in several encodings.
     elif data[:4] == EBCDIC_MARKER:
         bom_encoding = "cp037"
@@ -176,6 +238,7 @@ def convert_to_utf8(
         bom_encoding = "utf-32be"
     elif data[:4] == UTF32LE_MARKER:
         bom_encoding = "utf-32le"
+    data = data[bom_length:]
 
     tempdata = data
     try:
@@ -258,12 +321,6 @@ def convert_to_utf8(
     if xml_encoding.lower() == "gb2312":
         xml_encoding = "gb18030"
 
-    # there are four encodings to keep track of:
-    # - http_encoding is the encoding declared in the Content-Type HTTP header
-    # - xml_encoding is the encoding declared in the <?xml declaration
-    # - bom_encoding is the encoding sniffed from the first 4 bytes of the XML data
-    # - rfc3023_encoding is the actual encoding, as per RFC 3023
-    #   and a variety of other conflicting specifications
     error: FeedparserError | None = None
 
     if http_headers and (not acceptable_content_type):
@@ -273,21 +330,38 @@ def convert_to_utf8(
             msg = "no Content-type specified"
         error = NonXMLContentType(msg)
 
-    # determine character encoding
-    known_encoding = False
-    tried_encodings = []
-    # try: HTTP encoding, declared XML encoding, encoding sniffed from BOM
-    for encoding_to_try in (
+    return _SniffedEncoding(
+        bom_length,
+        http_content_type,
+        json,
         rfc3023_encoding,
         xml_encoding,
         bom_encoding,
-        lazy_chardet_encoding,
+        error,
+    )
+
+
+def _encoding_candidates(sniffed, encoding_hint, detect):
+    """Yield the encodings to try, in order of preference.
+
+    *detect* is called to guess the encoding with chardet
+    only if the encodings before it don't work.
+    """
+
+    tried_encodings = []
+    # try: HTTP encoding, declared XML encoding, encoding sniffed from BOM
+    for encoding_to_try in (
+        sniffed.rfc3023_encoding,
+        sniffed.xml_encoding,
+        sniffed.bom_encoding,
+        encoding_hint,
+        detect,
         "utf-8",
         "windows-1252",
         "iso-8859-2",
     ):
         if callable(encoding_to_try):
-            proposed_encoding = encoding_to_try(data)
+            proposed_encoding = encoding_to_try()
         else:
             proposed_encoding = encoding_to_try
         if not proposed_encoding:
@@ -295,28 +369,24 @@ def convert_to_utf8(
         if proposed_encoding in tried_encodings:
             continue
         tried_encodings.append(proposed_encoding)
-        try:
-            text = data.decode(proposed_encoding)
-        except (UnicodeDecodeError, LookupError):
-            continue
+        yield proposed_encoding
 
-        known_encoding = True
-        if not json:
-            # Update the encoding in the opening XML processing instruction.
-            new_declaration = """<?xml version='1.0' encoding='utf-8'?>"""
-            if RE_XML_DECLARATION.search(text):
-                text = RE_XML_DECLARATION.sub(new_declaration, text)
-            else:
-                text = new_declaration + "\n" + text
-        data = text.encode("utf-8")
-        break
+
+def _set_detected_encoding(result, sniffed, proposed_encoding):
+    """Set result like convert_to_utf8() would, once an encoding was chosen.
+
+    *proposed_encoding* is None if no encoding worked.
+    """
+
+    error = sniffed.error
+    rfc3023_encoding = sniffed.rfc3023_encoding
 
     # if still no luck, give up
-    if not known_encoding:
+    if proposed_encoding is None:
         error = CharacterEncodingUnknown(
             "document encoding unknown, I tried "
             + "%s, %s, utf-8, windows-1252, and iso-8859-2 but nothing worked"
-            % (rfc3023_encoding, xml_encoding)
+            % (rfc3023_encoding, sniffed.xml_encoding)
         )
         rfc3023_encoding = ""
     elif proposed_encoding != rfc3023_encoding:
@@ -326,12 +396,19 @@ def convert_to_utf8(
         )
         rfc3023_encoding = proposed_encoding
 
-    result["content-type"] = http_content_type  # for selecting the parser
+    result["content-type"] = sniffed.http_content_type  # for selecting the parser
     result["encoding"] = rfc3023_encoding
     if error:
         result["bozo"] = True
         result["bozo_exception"] = error
-    return data
+
+
+def _replace_xml_declaration(text):
+    # Update the encoding in the opening XML processing instruction.
+    new_declaration = """<?xml version='1.0' encoding='utf-8'?>"""
+    if RE_XML_DECLARATION.search(text):
+        return RE_XML_DECLARATION.sub(new_declaration, text)
+    return new_declaration + "\n" + text
 
 
 # How much to read from a binary file in order to detect encoding.
@@ -347,7 +424,12 @@ CONVERT_FILE_TEST_CHUNK_LEN = 2**16
 
 
 def convert_file_to_utf8(
-    http_headers, file, result, optimistic_encoding_detection=True
+    http_headers,
+    file,
+    result,
+    optimistic_encoding_detection=True,
+    encoding_hint=None,
+    validate=True,
 ):
     """Like convert_to_utf8(), but for a stream.
 
@@ -360,7 +442,8 @@ def convert_file_to_utf8(
     To detect the encoding, only a prefix of the file contents is used.
     In rare cases, the wrong encoding may be detected for this prefix;
     use optimistic_encoding_detection=False to use the entire file contents
-    (equivalent to a plain convert_to_utf8() call).
+    (equivalent to a plain convert_to_utf8() call, but if the file is seekable,
+    it is decoded in chunks instead of being read in memory).
 
     Args:
         http_headers (dict): The response headers.
@@ -368,6 +451,15 @@ def convert_file_to_utf8(
         result (dict): The result dictionary.
         optimistic_encoding_detection (bool):
             If true, use only a prefix of the file content to detect encoding.
+        encoding_hint (str or None):
+            An encoding that worked for this feed before. It is only used
+            to detect the encoding of the prefix; if the rest of the file
+            cannot be decoded with it, the encoding is detected from scratch.
+        validate (bool):
+            If false, do not check that the entire file can be decoded
+            with the encoding detected from its prefix. Reading the text
+            stream then raises UnicodeDecodeError if it cannot; the caller
+            must start over with optimistic_encoding_detection=False.
 
     Returns:
         StreamFactory: a stream factory, with the detected encoding set, if any
@@ -390,8 +482,13 @@ def convert_file_to_utf8(
         return StreamFactory(prefix, file, "utf-8")
 
     if optimistic_encoding_detection:
-        prefix = convert_file_prefix_to_utf8(http_headers, file, result)
+        start = file.tell()
+        prefix = convert_file_prefix_to_utf8(
+            http_headers, file, result, encoding_hint=encoding_hint
+        )
         factory = StreamFactory(prefix, file, result.get("encoding"))
+        if not validate:
+            return factory
 
         # Before returning factory, ensure the entire file can be decoded;
         # if it cannot, fall back to convert_to_utf8().
@@ -401,19 +498,25 @@ def convert_file_to_utf8(
         # breaking the 6.x API.
 
         try:
-            text_file = factory.get_text_file()
+            if callable(getattr(file, "getbuffer", None)):
+                # in-memory and memory-mapped files can be validated in place
+                _validate_buffer(file, factory.encoding)
+            else:
+                text_file = factory.get_text_file()
+                # read in chunks to limit memory usage
+                while text_file.read(CONVERT_FILE_TEST_CHUNK_LEN):
+                    pass
         except MissingEncoding:
             return factory
-        try:
-            # read in chunks to limit memory usage
-            while text_file.read(CONVERT_FILE_TEST_CHUNK_LEN):
-                pass
         except UnicodeDecodeError:
-            # fall back to convert_to_utf8()
-            file = factory.get_binary_file()
+            # fall back to detecting the encoding from the entire file
+            file.seek(start)
         else:
             return factory
 
+    if callable(getattr(file, "seekable", None)) and file.seekable():
+        return _convert_seekable_file_to_utf8(http_headers, file, result)
+
     # this shouldn't increase memory usage if file is BytesIO,
     # since BytesIO does copy-on-write; https://bugs.python.org/issue22003
     data = convert_to_utf8(http_headers, file.read(), result)
@@ -422,6 +525,81 @@ def convert_file_to_utf8(
     return StreamFactory(data, io.BytesIO(b""), result.get("encoding"))
 
 
+def _convert_seekable_file_to_utf8(http_headers, file, result):
+    """Like convert_to_utf8(), but decode the file in chunks to detect its encoding.
+
+    Each candidate encoding is tried on the entire file, one chunk at a time,
+    so the file is never held in memory as a whole.
+    """
+
+    start = file.tell()
+    prefix = file.read(CONVERT_FILE_PREFIX_LEN)
+    sniffed = _sniff_encoding(http_headers, prefix)
+    start += sniffed.bom_length
+    prefix = prefix[sniffed.bom_length :]
+
+    def detect():
+        if lazy_chardet_file_encoding is None:
+            return None
+        file.seek(start)
+        return lazy_chardet_file_encoding(file)
+
+    for proposed_encoding in _encoding_candidates(sniffed, None, detect):
+        if _decodes_completely(file, start, proposed_encoding):
+            break
+    else:
+        proposed_encoding = None
+
+    _set_detected_encoding(result, sniffed, proposed_encoding)
+    if proposed_encoding is None:
+        file.seek(start)
+        return StreamFactory(b"", file, None)
+
+    # Convert the prefix, up to the last complete character in it,
+    # and continue reading the file after that character.
+    decoder = codecs.getincrementaldecoder(proposed_encoding)("strict")
+    text = decoder.decode(prefix)
+    pending, _ = decoder.getstate()
+    file.seek(start + len(prefix) - len(pending))
+    if not sniffed.json:
+        text = _replace_xml_declaration(text)
+    return StreamFactory(text.encode("utf-8"), file, proposed_encoding)
+
+
+def _decodes_completely(file, start, encoding):
+    """Check whether *file* can be decoded with *encoding* from *start* on."""
+
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)("strict")
+    except LookupError:
+        return False
+    file.seek(start)
+    try:
+        while True:
+            chunk = file.read(CONVERT_FILE_TEST_CHUNK_LEN)
+            if not chunk:
+                break
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _validate_buffer(file, encoding):
+    """Check that *file* decodes with *encoding* from its buffer, from tell() on."""
+
+    if encoding is None:
+        raise MissingEncoding("cannot validate buffer without encoding")
+
+    # Like the text stream returned by StreamFactory.get_text_file(),
+    # ignore an incomplete multibyte sequence at the very end.
+    decoder = codecs.getincrementaldecoder(encoding)("strict")
+    with file.getbuffer() as buffer:
+        for offset in range(file.tell(), len(buffer), CONVERT_FILE_TEST_CHUNK_LEN):
+            decoder.decode(buffer[offset : offset + CONVERT_FILE_TEST_CHUNK_LEN])
+
+
 def convert_file_prefix_to_utf8(
     http_headers,
     file: typing.IO[bytes],
@@ -429,10 +607,12 @@ def convert_file_prefix_to_utf8(
     *,
     prefix_len: int = CONVERT_FILE_PREFIX_LEN,
     read_to_ascii_len: int = 2**8,
+    encoding_hint: str | None = None,
 ) -> bytes:
     """Like convert_to_utf8(), but only use the prefix of a binary file.
 
-    Set result like convert_to_utf8() would.
+    Set result like convert_to_utf8() would. If the prefix decodes with
+    *encoding_hint*, no further attempts are made to find a better match.
 
     Return the updated prefix, as bytes.
 
@@ -462,11 +642,16 @@ def convert_file_prefix_to_utf8(
         prefix += byte
 
         fake_result: typing.Any = {}
-        converted_prefix = convert_to_utf8(http_headers, prefix, fake_result)
+        converted_prefix = convert_to_utf8(
+            http_headers, prefix, fake_result, encoding_hint=encoding_hint
+        )
 
         # an encoding was detected successfully, keep it
         if not fake_result.get("bozo"):
             break
+        # the encoding that worked before works again, keep it
+        if encoding_hint and fake_result.get("encoding") == encoding_hint:
+            break
 
         candidates.append((file.tell(), converted_prefix, fake_result))
 
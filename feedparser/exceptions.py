@@ -30,6 +30,7 @@ __all__ = [
     "FeedparserError",
     "CharacterEncodingOverride",
     "CharacterEncodingUnknown",
+    "ContentTooLarge",
     "NonXMLContentType",
     "UndeclaredNamespace",
 ]
@@ -51,5 +52,13 @@ class NonXMLContentType(FeedparserError):
     pass
 
 
+class ContentTooLarge(FeedparserError):
+    pass
+
+
 class UndeclaredNamespace(Exception):
     pass
+
+
+class _EntryLimitReached(Exception):
+    """Raised by the feed parsers to stop parsing once max_entries is reached."""
@@ -28,8 +28,38 @@
 import html.entities
 import re
 
+from .sgml import endbracket as _endbracket
 from .sgml import sgmllib
 
+# How BaseHTMLProcessor splits markup into tags, text, and references:
+# "scanner" uses BaseHTMLProcessor's own scanner, and "sgmllib" uses
+# SGMLParser's. Both report the same events; the scanner is faster.
+HTML_TOKENIZER = "scanner"
+
+# The patterns that SGMLParser tokenizes markup with.
+_interesting = sgmllib.interesting
+_incomplete = sgmllib.incomplete
+_entityref = sgmllib.entityref
+_charref = sgmllib.charref
+_starttagopen = sgmllib.starttagopen
+_shorttagopen = sgmllib.shorttagopen
+_shorttag = sgmllib.shorttag
+_tagfind = sgmllib.tagfind
+_attrfind = sgmllib.attrfind
+
+# The scanner keeps SGMLParser's state the way that SGMLParser itself does:
+# get_starttag_text() returns the private _SGMLParser__starttag_text, and
+# _retry_at makes feed() wait for more data when no progress was made.
+# If a version of sgmllib doesn't have them, SGMLParser tokenizes instead.
+_SGMLLIB_STATE_KNOWN = all(
+    hasattr(sgmllib.SGMLParser(), name)
+    for name in ("_SGMLParser__starttag_text", "_retry_at")
+)
+
+# What BaseHTMLProcessor._rewrite() escapes and expands before tokenizing.
+_DECLARATION_OPEN = re.compile(r"<!((?!DOCTYPE|--|\[))", re.IGNORECASE)
+_SELF_CLOSING_TAG = re.compile(r"<([^<>\s]+?)\s*/>")
+
 _cp1252 = {
     128: "\u20ac",  # euro sign
     130: "\u201a",  # single low-9 quotation mark
@@ -93,8 +123,37 @@ class BaseHTMLProcessor(sgmllib.SGMLParser):
         self.pieces = []
         super().__init__()
 
+    # Whether goahead() can use the scanner; see _can_scan().
+    _scannable: bool
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._scannable = cls._can_scan()
+
+    @classmethod
+    def _can_scan(cls):
+        """Tell whether the scanner reports the same events as SGMLParser.
+
+        That is the case unless the class handles specific tags with
+        start_*, do_*, or end_* methods, or changes how tags are parsed.
+        """
+
+        if not _SGMLLIB_STATE_KNOWN:
+            return False
+        if any(name.startswith(("start_", "do_", "end_")) for name in dir(cls)):
+            return False
+        return (
+            cls.parse_starttag is BaseHTMLProcessor.parse_starttag
+            and cls.parse_endtag is sgmllib.SGMLParser.parse_endtag
+            and cls.finish_starttag is sgmllib.SGMLParser.finish_starttag
+            and cls.finish_shorttag is sgmllib.SGMLParser.finish_shorttag
+            and cls.finish_endtag is sgmllib.SGMLParser.finish_endtag
+        )
+
     def reset(self):
         self.pieces = []
+        self._held_back = ""
+        self._closing = False
         super().reset()
 
     def _shorttag_replace(self, match):
@@ -115,18 +174,244 @@ class BaseHTMLProcessor(sgmllib.SGMLParser):
                 self.unknown_endtag(self.lasttag)
         return j
 
+    def goahead(self, end):
+        """
+        :type end: bool
+        :rtype: None
+
+        Handle as much of the data as possible, like SGMLParser.goahead().
+        Unless HTML_TOKENIZER is "sgmllib", tags are parsed by _scan_starttag()
+        and _scan_endtag(), which do what parse_starttag() and parse_endtag()
+        would, without looking for handler methods that don't exist.
+        """
+
+        if (
+            HTML_TOKENIZER != "scanner"
+            or not self._scannable
+            or self.literal
+            or self.nomoretags
+        ):
+            super().goahead(end)
+            return
+
+        rawdata = self.rawdata
+        i = 0
+        n = len(rawdata)
+        handle_data = self.handle_data
+        while i < n:
+            match = _interesting.search(rawdata, i)
+            j = match.start() if match else n
+            if i < j:
+                handle_data(rawdata[i:j])
+            i = j
+            if i == n:
+                break
+            if rawdata[i] == "<":
+                if _starttagopen.match(rawdata, i):
+                    k = self._scan_starttag(rawdata, i)
+                    if k < 0:
+                        break
+                    i = k
+                    continue
+                if rawdata.startswith("</", i):
+                    k = self._scan_endtag(rawdata, i)
+                    if k < 0:
+                        break
+                    i = k
+                    continue
+                if rawdata.startswith("<!--", i):
+                    k = self.parse_comment(i)
+                    if k < 0:
+                        break
+                    i = k
+                    continue
+                if rawdata.startswith("<?", i):
+                    k = self.parse_pi(i)
+                    if k < 0:
+                        break
+                    i = i + k
+                    continue
+                if rawdata.startswith("<!", i):
+                    try:
+                        k = self.parse_declaration(i)
+                    except AssertionError as error:
+                        raise sgmllib.SGMLParseError(error.args)
+                    if k < 0:
+                        break
+                    i = k
+                    continue
+            else:
+                match = _charref.match(rawdata, i)
+                if match:
+                    self.handle_charref(match.group(1))
+                    i = match.end()
+                    continue
+                match = _entityref.match(rawdata, i)
+                if match:
+                    self.handle_entityref(match.group(1))
+                    i = match.end()
+                    if rawdata[i - 1] != ";":
+                        i = i - 1
+                    continue
+            match = _incomplete.match(rawdata, i)
+            if not match:
+                handle_data(rawdata[i])
+                i = i + 1
+                continue
+            j = match.end()
+            if j == n:
+                break  # Really incomplete
+            handle_data(rawdata[i:j])
+            i = j
+        if end and i < n:
+            handle_data(rawdata[i:n])
+            i = n
+        self.rawdata = rawdata[i:]
+        # Back off like SGMLParser.goahead() when no progress was made.
+        self._retry_at = n * 2 if i == 0 and n > 0 else 0
+
+    def _scan_starttag(self, rawdata, i):
+        """
+        :type rawdata: str
+        :type i: int
+        :rtype: int
+        """
+
+        if _shorttagopen.match(rawdata, i):
+            # SGML shorthand: <tag/data/ == <tag>data</tag>
+            match = _shorttag.match(rawdata, i)
+            if not match:
+                return -1
+            tag, data = match.group(1, 2)
+            j = match.end()
+            self._SGMLParser__starttag_text = rawdata[i : match.end(1) + 1]
+            tag = tag.lower()
+            self.unknown_starttag(tag, [])
+            self.handle_data(data)
+            self.unknown_endtag(tag)
+        else:
+            match = _endbracket.match(rawdata, i + 1)
+            if match is None:
+                return -1
+            j = match.end()
+            attrs = []
+            if rawdata[i + 1] == ">":
+                # SGML shorthand: <> == <last open tag seen>
+                k = j
+                tag = self.lasttag
+            else:
+                k = _tagfind.match(rawdata, i + 1).end()
+                tag = self.lasttag = rawdata[i + 1 : k].lower()
+            while k < j:
+                match = _attrfind.match(rawdata, k)
+                if not match:
+                    break
+                attrname, rest, attrvalue = match.group(1, 2, 3)
+                if not rest:
+                    attrvalue = attrname
+                else:
+                    if (
+                        attrvalue[:1] == "'" == attrvalue[-1:]
+                        or attrvalue[:1] == '"' == attrvalue[-1:]
+                    ):
+                        # strip quotes
+                        attrvalue = attrvalue[1:-1]
+                    if "&" in attrvalue:
+                        attrvalue = self.entity_or_charref.sub(
+                            self._convert_ref, attrvalue
+                        )
+                attrs.append((attrname.lower(), attrvalue))
+                k = match.end()
+            if rawdata[j] == ">":
+                j = j + 1
+            self._SGMLParser__starttag_text = rawdata[i:j]
+            self.unknown_starttag(tag, attrs)
+        if self._type == "application/xhtml+xml":
+            if j > 2 and rawdata[j - 2 : j] == "/>":
+                self.unknown_endtag(self.lasttag)
+        return j
+
+    def _scan_endtag(self, rawdata, i):
+        """
+        :type rawdata: str
+        :type i: int
+        :rtype: int
+        """
+
+        match = _endbracket.match(rawdata, i + 1)
+        if match is None:
+            return -1
+        j = match.end()
+        tag = rawdata[i + 2 : j].strip().lower()
+        if rawdata[j] == ">":
+            j = j + 1
+        match = _tagfind.match(tag)
+        if match is not None:
+            tag = match.group()
+        self.unknown_endtag(tag)
+        return j
+
     def feed(self, data):
         """
         :type data: str
         :rtype: None
+
+        Parse ``data`` as the complete document.
+        Use feed_chunk() to feed the document in several pieces.
+        """
+
+        self.feed_chunk(data)
+        self.close()
+
+    def feed_chunk(self, data):
         """
+        :type data: str
+        :rtype: None
 
-        data = re.sub(r"<!((?!DOCTYPE|--|\[))", r"&lt;!\1", data, flags=re.IGNORECASE)
-        data = re.sub(r"<([^<>\s]+?)\s*/>", self._shorttag_replace, data)
+        This can be called repeatedly with consecutive chunks of the document.
+        Call close() after the last chunk.
+        """
+
+        data = self._held_back + data
+
+        # Hold back the tail of the chunk that cannot be handled
+        # until more data arrives: a tag or declaration that is not closed
+        # yet (the rewrites below need all of it), or what may be
+        # an unterminated entity or character reference (the rewrites,
+        # and SGMLParser itself for hexadecimal references, need all of it).
+        end = len(data)
+        after_last_bracket = data.rfind(">") + 1
+        tag_start = data.find("<", after_last_bracket)
+        if tag_start != -1:
+            end = tag_start
+        ref_start = data.rfind("&", max(after_last_bracket, end - 32), end)
+        if ref_start != -1 and ";" not in data[ref_start:end]:
+            end = ref_start
+        data, self._held_back = data[:end], data[end:]
+
+        super().feed(self._rewrite(data))
+
+    def close(self):
+        """
+        :rtype: None
+        """
+
+        data, self._held_back = self._held_back, ""
+        super().feed(self._rewrite(data))
+        self._closing = True
+        super().close()
+
+    def _rewrite(self, data):
+        """
+        :type data: str
+        :rtype: str
+        """
+
+        data = _DECLARATION_OPEN.sub(r"&lt;!\1", data)
+        data = _SELF_CLOSING_TAG.sub(self._shorttag_replace, data)
         data = data.replace("&#39;", "'")
         data = data.replace("&#34;", '"')
-        super().feed(data)
-        super().close()
+        return data
 
     @staticmethod
     def normalize_attrs(attrs):
@@ -157,21 +442,27 @@ class BaseHTMLProcessor(sgmllib.SGMLParser):
         # Called for each start tag
         # attrs is a list of (attr, value) tuples
         # e.g. for <pre class='screen'>, tag='pre', attrs=[('class', 'screen')]
-        uattrs = []
         strattrs = ""
         if attrs:
-            for key, value in attrs:
-                value = value.replace(">", "&gt;")
-                value = value.replace("<", "&lt;")
-                value = value.replace('"', "&quot;")
-                value = self.bare_ampersand.sub("&amp;", value)
-                uattrs.append((key, value))
-            strattrs = "".join(f' {key}="{value}"' for key, value in uattrs)
+            strattrs = "".join(
+                f' {key}="{self._escape_attribute(value)}"' for key, value in attrs
+            )
         if tag in self.elements_no_end_tag:
             self.pieces.append(f"<{tag}{strattrs} />")
         else:
             self.pieces.append(f"<{tag}{strattrs}>")
 
+    def _escape_attribute(self, value):
+        """
+        :type value: str
+        :rtype: str
+        """
+
+        value = value.replace(">", "&gt;")
+        value = value.replace("<", "&lt;")
+        value = value.replace('"', "&quot;")
+        return self.bare_ampersand.sub("&amp;", value)
+
     def unknown_endtag(self, tag):
         """
         :type tag: str
@@ -318,3 +609,6 @@ class BaseHTMLProcessor(sgmllib.SGMLParser):
             # Escape the doctype declaration and continue parsing.
             self.handle_data("&lt;")
             return i + 1
+
+
+BaseHTMLProcessor._scannable = BaseHTMLProcessor._can_scan()
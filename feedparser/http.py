@@ -27,11 +27,22 @@
 
 from __future__ import annotations
 
+import calendar
+import datetime
+import email.utils
+import http.cookiejar
+import io
+import os
+import tempfile
+import threading
+import time
 import typing
 
 import requests
+import requests.adapters
 
 from .datetimes import _parse_date
+from .exceptions import ContentTooLarge
 
 # HTTP "Accept" header to send to servers when downloading feeds.
 ACCEPT_HEADER: str = (
@@ -45,18 +56,154 @@ ACCEPT_HEADER: str = (
     ";q=0.1"
 )
 
+# How long to wait for the server, in seconds, when requesting a feed.
+# This may also be a (connect timeout, read timeout) tuple.
+TIMEOUT: float | tuple[float, float] = 10
+
+# Connection pool sizes for the default session.
+# POOL_CONNECTIONS is the number of hosts to keep connection pools for;
+# POOL_MAXSIZE is the number of connections to keep open to each host.
+# These are only used when the default session is created.
+POOL_CONNECTIONS: int = 10
+POOL_MAXSIZE: int = 10
+
+# Response bodies are read in chunks of this many bytes.
+CHUNK_SIZE: int = 2**16
+
+# Response bodies larger than this many bytes are spooled to a temporary file
+# on disk instead of being kept in memory.
+SPOOL_MAX_SIZE: int = 2**20
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def create_session(
+    *,
+    pool_connections: int | None = None,
+    pool_maxsize: int | None = None,
+) -> requests.Session:
+    """Create a session that keeps HTTP connections open between requests.
+
+    Pool sizes default to :data:`POOL_CONNECTIONS` and :data:`POOL_MAXSIZE`.
+    The session doesn't keep cookies, so one feed's server cannot set
+    cookies that are then sent with requests for other feeds.
+    """
+
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_connections or POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize or POOL_MAXSIZE,
+    )
+    session = requests.Session()
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide default session, creating it if necessary."""
+
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def set_session(session: requests.Session | None) -> None:
+    """Replace the process-wide default session.
+
+    Passing None discards the current session;
+    a new one will be created the next time a feed is requested.
+    """
+
+    global _session
+
+    with _session_lock:
+        _session = session
+
+
+def _forget_session() -> None:
+    # Pooled connections must not be shared with a forked child process.
+    global _session, _session_lock
+
+    _session = None
+    _session_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_session)
+
+
+def _format_http_date(
+    modified: str | datetime.datetime | time.struct_time | tuple[int, ...],
+) -> str:
+    """Convert a date to the format used by the If-Modified-Since header.
+
+    Strings are assumed to be correctly formatted already (for example,
+    the ``modified`` value from a previous result) and are passed through.
+    Naive datetimes and 9-tuples are assumed to be in UTC,
+    matching the ``*_parsed`` values that feedparser returns.
+    """
+
+    if isinstance(modified, str):
+        return modified
+    if isinstance(modified, datetime.datetime):
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=datetime.timezone.utc)
+        timestamp = modified.timestamp()
+    else:
+        timestamp = calendar.timegm(tuple(modified))
+    return email.utils.formatdate(timestamp, usegmt=True)
+
+
+def get(
+    url: str,
+    result: dict[str, typing.Any],
+    *,
+    etag: str | None = None,
+    modified: (
+        str | datetime.datetime | time.struct_time | tuple[int, ...] | None
+    ) = None,
+    session: requests.Session | None = None,
+    timeout: float | tuple[float, float] | None = None,
+    max_bytes: int | None = None,
+) -> typing.IO[bytes]:
+    """Request *url* and record the response metadata in *result*.
+
+    *session* may be a :class:`requests.Session`, or any object with
+    a compatible ``get()`` method. If it is None, the default session
+    returned by :func:`get_session` is used.
+    *timeout* defaults to :data:`TIMEOUT`.
+
+    The response body is streamed in chunks of :data:`CHUNK_SIZE` bytes
+    into a temporary file, which is kept in memory until it grows larger than
+    :data:`SPOOL_MAX_SIZE` bytes. The returned file is positioned at the start.
+
+    If *max_bytes* is given, reading stops once the (decompressed) body
+    grows past that size, and :class:`ContentTooLarge` is raised.
+    """
+
+    headers = {"Accept": ACCEPT_HEADER}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = _format_http_date(modified)
 
-def get(url: str, result: dict[str, typing.Any]) -> bytes:
     try:
-        response = requests.get(
+        response = (session or get_session()).get(
             url,
-            headers={"Accept": ACCEPT_HEADER},
-            timeout=10,
+            headers=headers,
+            timeout=TIMEOUT if timeout is None else timeout,
+            stream=True,
         )
     except requests.RequestException as exception:
         result["bozo"] = True
         result["bozo_exception"] = exception
-        return b""
+        return io.BytesIO(b"")
 
     # Lowercase the HTTP header keys for comparisons per RFC 2616.
     result["headers"] = {k.lower(): v for k, v in response.headers.items()}
@@ -71,4 +218,26 @@ def get(url: str, result: dict[str, typing.Any]) -> bytes:
             result["modified_parsed"] = _parse_date(modified)
     result["href"] = response.url
     result["status"] = response.status_code
-    return response.content
+
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        # Closing the response returns the connection to the session's pool.
+        with response:
+            size = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    message = f"content is larger than {max_bytes} bytes"
+                    raise ContentTooLarge(message)
+                file.write(chunk)
+    except ContentTooLarge:
+        file.close()
+        raise
+    except requests.RequestException as exception:
+        file.close()
+        result["bozo"] = True
+        result["bozo_exception"] = exception
+        return io.BytesIO(b"")
+
+    file.seek(0)
+    return file
@@ -27,7 +27,6 @@
 
 import base64
 import binascii
-import copy
 import html.entities
 import re
 import xml.sax.saxutils
@@ -45,6 +44,13 @@ email_pattern = re.compile(
 )
 
 
+class _DiscardedText(list):
+    """Collects nothing; used for elements left out by a fields projection."""
+
+    def append(self, text):
+        pass
+
+
 class XMLParserMixin(
     _base.Namespace,
     cc.Namespace,
@@ -169,6 +175,29 @@ class XMLParserMixin(
         "text/html",
     }
 
+    # The keys each expensive element may set in an entry or in the feed.
+    # When none of them are in self.fields, the element's text is discarded
+    # instead of being decoded, resolved, sanitized, or parsed as a date.
+    projectable_elements = {
+        "content": {"content", "summary"},
+        "description": {
+            "content",
+            "summary",
+            "summary_detail",
+            "subtitle",
+            "subtitle_detail",
+        },
+        "info": {"info", "info_detail"},
+        "rights": {"rights", "rights_detail"},
+        "subtitle": {"subtitle", "subtitle_detail"},
+        "summary": {"content", "summary", "summary_detail"},
+        "title": {"title", "title_detail"},
+        "published": {"published", "published_parsed"},
+        "updated": {"updated", "updated_parsed"},
+        "created": {"created", "created_parsed"},
+        "expired": {"expired", "expired_parsed"},
+    }
+
     def __init__(self):
         if not self._matchnamespaces:
             for k, v in self.namespaces.items():
@@ -179,6 +208,10 @@ class XMLParserMixin(
         self.namespaces_in_use = {}  # dictionary of namespaces defined by the feed
         self.resolve_relative_uris = False
         self.sanitize_html = False
+        self.sanitizer_cache = None  # a SanitizerCache for embedded markup, if any
+        self.sanitizer_policy = None  # the SanitizerPolicy to sanitize with, if any
+        self.max_entries = None  # stop parsing before entry max_entries + 1
+        self.fields = None  # the set of keys to compute, or None for all keys
 
         # the following are used internally to track state;
         # this is really out of control and should be refactored
@@ -221,14 +254,21 @@ class XMLParserMixin(
         raise NotImplementedError
 
     def unknown_starttag(self, tag, attrs):
-        # increment depth counter
-        self.depth += 1
-
         # normalize attrs
         attrs = [self._normalize_attributes(attr) for attr in attrs]
+        return self._handle_starttag(tag, dict(attrs), attrs)
+
+    def _handle_starttag(self, tag, attrs_d, attrs):
+        """Handle a start tag whose attributes are already normalized.
+
+        *attrs* holds the same attributes as *attrs_d*, as (name, value)
+        pairs in document order; it may be *attrs_d*'s items view.
+        """
+
+        # increment depth counter
+        self.depth += 1
 
         # track xml:base and xml:lang
-        attrs_d = dict(attrs)
         baseuri = attrs_d.get("xml:base", attrs_d.get("base")) or self.baseuri
         if isinstance(baseuri, bytes):
             baseuri = baseuri.decode(self.encoding, "ignore")
@@ -266,6 +306,7 @@ class XMLParserMixin(
             # element declared itself as escaped markup, but it isn't really
             self.contentparams["type"] = "application/xhtml+xml"
         if self.incontent and self.contentparams.get("type") == "application/xhtml+xml":
+            attrs = list(attrs)
             if tag.find(":") != -1:
                 prefix, tag = tag.split(":", 1)
                 namespace = self.namespaces_in_use.get(prefix, "")
@@ -301,21 +342,23 @@ class XMLParserMixin(
         ):
             self.inimage = 0
 
-        # call special handler (if defined) or default handler
-        methodname = "_start_" + prefix + suffix
-        try:
-            method = getattr(self, methodname)
-            return method(attrs_d)
-        except AttributeError:
-            # Since there's no handler or something has gone wrong we
-            # explicitly add the element and its attributes.
-            unknown_tag = prefix + suffix
-            if len(attrs_d) == 0:
-                # No attributes so merge it into the enclosing dictionary
-                return self.push(unknown_tag, 1)
-            # Has attributes so create it in its own dictionary
-            context = self._get_context()
-            context[unknown_tag] = attrs_d
+        # call special handler (if defined) or default handler;
+        # only methods are handlers, not other attributes with the same prefix
+        method = getattr(self, "_start_" + prefix + suffix, None)
+        if callable(method):
+            try:
+                return method(attrs_d)
+            except AttributeError:
+                pass
+        # Since there's no handler or something has gone wrong we
+        # explicitly add the element and its attributes.
+        unknown_tag = prefix + suffix
+        if len(attrs_d) == 0:
+            # No attributes so merge it into the enclosing dictionary
+            return self.push(unknown_tag, 1)
+        # Has attributes so create it in its own dictionary
+        context = self._get_context()
+        context[unknown_tag] = attrs_d
 
     def unknown_endtag(self, tag):
         # match namespaces
@@ -330,14 +373,14 @@ class XMLParserMixin(
             self.svgOK -= 1
 
         # call special handler (if defined) or default handler
-        methodname = "_end_" + prefix + suffix
-        try:
-            if self.svgOK:
-                raise AttributeError()
-            method = getattr(self, methodname)
-            method()
-        except AttributeError:
+        method = None if self.svgOK else getattr(self, "_end_" + prefix + suffix, None)
+        if not callable(method):
             self.pop(prefix + suffix)
+        else:
+            try:
+                method()
+            except AttributeError:
+                self.pop(prefix + suffix)
 
         # track inline content
         if self.incontent and not self.contentparams.get("type", "xml").endswith("xml"):
@@ -421,6 +464,9 @@ class XMLParserMixin(
             k = self.rawdata.find("]]>", i)
             if k == -1:
                 # CDATA block began but didn't finish
+                if not self._closing:
+                    # wait for more data
+                    return -1
                 k = len(self.rawdata)
                 return k
             self.handle_data(xml.sax.saxutils.escape(self.rawdata[i + 9 : k]), 0)
@@ -476,7 +522,15 @@ class XMLParserMixin(
         )
 
     def push(self, element, expecting_text):
-        self.elementstack.append([element, expecting_text, []])
+        pieces = []
+        if (
+            self.fields is not None
+            and element in self.projectable_elements
+            and not (self.insource or self.inimage or self.intextinput)
+            and self.fields.isdisjoint(self.projectable_elements[element])
+        ):
+            pieces = _DiscardedText()
+        self.elementstack.append([element, expecting_text, pieces])
 
     def pop(self, element, strip_whitespace=1):
         if not self.elementstack:
@@ -485,6 +539,8 @@ class XMLParserMixin(
             return
 
         element, expecting_text, pieces = self.elementstack.pop()
+        if isinstance(pieces, _DiscardedText):
+            return ""
 
         # Ensure each piece is a str for Python 3
         for i, v in enumerate(pieces):
@@ -565,22 +621,34 @@ class XMLParserMixin(
             self.map_content_type(self.contentparams.get("type", "text/html"))
             in self.html_types
         )
+        resolve = (
+            is_htmlish
+            and self.resolve_relative_uris
+            and element in self.can_contain_relative_uris
+        )
+        sanitize = (
+            is_htmlish
+            and self.sanitize_html
+            and element in self.can_contain_dangerous_markup
+        )
+        content_type = self.contentparams.get("type", "text/html")
+
+        # sanitize embedded markup, resolving relative URIs within it
+        # in the same pass when both are needed
+        if sanitize:
+            output = sanitize_html(
+                output,
+                self.encoding,
+                content_type,
+                self.baseuri if resolve else None,
+                self.sanitizer_cache,
+                self.sanitizer_policy,
+            )
         # resolve relative URIs within embedded markup
-        if is_htmlish and self.resolve_relative_uris:
-            if element in self.can_contain_relative_uris:
-                output = resolve_relative_uris(
-                    output,
-                    self.baseuri,
-                    self.encoding,
-                    self.contentparams.get("type", "text/html"),
-                )
-
-        # sanitize embedded markup
-        if is_htmlish and self.sanitize_html:
-            if element in self.can_contain_dangerous_markup:
-                output = sanitize_html(
-                    output, self.encoding, self.contentparams.get("type", "text/html")
-                )
+        elif resolve:
+            output = resolve_relative_uris(
+                output, self.baseuri, self.encoding, content_type
+            )
 
         if self.encoding and isinstance(output, bytes):
             output = output.decode(self.encoding, "ignore")
@@ -611,7 +679,7 @@ class XMLParserMixin(
         if self.inentry and not self.insource:
             if element == "content":
                 self.entries[-1].setdefault(element, [])
-                contentparams = copy.deepcopy(self.contentparams)
+                contentparams = FeedParserDict(self.contentparams)
                 contentparams["value"] = output
                 self.entries[-1][element].append(contentparams)
             elif element == "link":
@@ -635,7 +703,7 @@ class XMLParserMixin(
                     self.property_depth_map[self.entries[-1]][element] = self.depth
                     self.entries[-1][element] = output
                 if self.incontent:
-                    contentparams = copy.deepcopy(self.contentparams)
+                    contentparams = FeedParserDict(self.contentparams)
                     contentparams["value"] = output
                     self.entries[-1][element + "_detail"] = contentparams
         elif (
@@ -651,7 +719,7 @@ class XMLParserMixin(
                 context[element] = output
                 context["links"][-1]["href"] = output
             elif self.incontent:
-                contentparams = copy.deepcopy(self.contentparams)
+                contentparams = FeedParserDict(self.contentparams)
                 contentparams["value"] = output
                 context[element + "_detail"] = contentparams
         return output
@@ -29,6 +29,7 @@
 import copy
 
 from ..datetimes import _parse_date
+from ..exceptions import _EntryLimitReached
 from ..urls import make_safe_absolute_uri
 from ..util import FeedParserDict
 
@@ -253,6 +254,8 @@ class Namespace:
     _end_copyright = _end_rights
 
     def _start_item(self, attrs_d):
+        if self.max_entries is not None and len(self.entries) >= self.max_entries:
+            raise _EntryLimitReached
         self.entries.append(FeedParserDict())
         self.push("item", 0)
         self.inentry = 1
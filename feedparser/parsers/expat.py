@@ -0,0 +1,121 @@
+# A SAX driver that feeds Expat events to the strict feed parser directly
+# Copyright 2010-2025 Kurt McKee <contactme@kurtmckee.org>
+# Copyright 2002-2008 Mark Pilgrim
+# All rights reserved.
+#
+# This file is a part of feedparser.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 'AS IS'
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""A SAX driver for the strict parser that does less work per Expat event.
+
+It behaves like :mod:`xml.sax.expatreader`, and is selected the same way,
+by putting its module name first in ``feedparser.api.PREFERRED_XML_PARSERS``.
+The differences are:
+
+*   Expat buffers text, so each run of text is reported with one
+    ``characters()`` call instead of one call per line or entity.
+*   Element names, which Expat reports as ``"uri localname prefix"``
+    strings, are split once per distinct name instead of once per element.
+*   Elements without attributes share one empty attributes object.
+"""
+
+import xml.sax.expatreader
+from xml.sax.xmlreader import AttributesNSImpl
+
+# How many distinct element names each reader remembers the split form of.
+NAME_CACHE_SIZE = 1024
+
+# How much text Expat collects before reporting it, in characters.
+TEXT_BUFFER_SIZE = 2**16
+
+_NO_ATTRIBUTES = AttributesNSImpl({}, {})
+
+
+def _split_name(name):
+    parts = name.split()
+    if len(parts) == 1:
+        return None, name
+    return parts[0], parts[1]
+
+
+def _namespaced_attributes(attrs):
+    values = {}
+    qnames = {}
+    for name, value in attrs.items():
+        parts = name.split()
+        if len(parts) == 1:
+            pair = None, name
+            qname = name
+        elif len(parts) == 3:
+            pair = parts[0], parts[1]
+            qname = parts[2] + ":" + parts[1]
+        else:
+            pair = parts[0], parts[1]
+            qname = parts[1]
+        values[pair] = value
+        qnames[pair] = qname
+    return AttributesNSImpl(values, qnames)
+
+
+class ExpatReader(xml.sax.expatreader.ExpatParser):
+    def __init__(self, namespaceHandling=0, bufsize=2**16 - 20):
+        super().__init__(namespaceHandling, bufsize)
+        self._names = {}
+
+    def reset(self):
+        super().reset()
+        parser = self._parser
+        parser.buffer_text = True
+        parser.buffer_size = TEXT_BUFFER_SIZE
+        if not self._namespaces:
+            return
+
+        names = self._names
+        if len(names) > NAME_CACHE_SIZE:
+            names.clear()
+        start_element_ns = self._cont_handler.startElementNS
+        end_element_ns = self._cont_handler.endElementNS
+
+        def start_element(name, attrs):
+            try:
+                pair = names[name]
+            except KeyError:
+                pair = names[name] = _split_name(name)
+            if attrs:
+                start_element_ns(pair, None, _namespaced_attributes(attrs))
+            else:
+                start_element_ns(pair, None, _NO_ATTRIBUTES)
+
+        def end_element(name):
+            try:
+                pair = names[name]
+            except KeyError:
+                pair = names[name] = _split_name(name)
+            end_element_ns(pair, None)
+
+        parser.StartElementHandler = start_element
+        parser.EndElementHandler = end_element
+
+
+def create_parser(*args, **kwargs):
+    return ExpatReader(*args, **kwargs)
@@ -60,6 +60,11 @@ class JSONParser:
         self.feeddata = FeedParserDict()
         self.namespacesInUse = []
         self.entries = []
+        self.max_entries = None
+        self.truncated = False
+        self.fields = None
+        self.sanitizer_cache = None
+        self.sanitizer_policy = None
 
     def feed(self, file):
         data = json.load(file)
@@ -77,7 +82,11 @@ class JSONParser:
             self.parse_author(data["author"], self.feeddata)
         # TODO: hubs; expired has no RSS equivalent
 
-        self.entries = [self.parse_entry(e) for e in data["items"]]
+        items = data["items"]
+        if self.max_entries is not None and len(items) > self.max_entries:
+            items = items[: self.max_entries]
+            self.truncated = True
+        self.entries = [self.parse_entry(e) for e in items]
 
     def parse_entry(self, e):
         entry = FeedParserDict()
@@ -89,17 +98,21 @@ class JSONParser:
             entry["content"] = c = FeedParserDict()
             c["value"] = e["content_text"]
             c["type"] = "text"
-        elif "content_html" in e:
+        elif "content_html" in e and self._wants("content"):
             entry["content"] = c = FeedParserDict()
             c["value"] = sanitize_html(
-                e["content_html"], self.encoding, "application/json"
+                e["content_html"],
+                self.encoding,
+                "application/json",
+                cache=self.sanitizer_cache,
+                policy=self.sanitizer_policy,
             )
             c["type"] = "html"
 
-        if "date_published" in e:
+        if "date_published" in e and self._wants("published", "published_parsed"):
             entry["published"] = e["date_published"]
             entry["published_parsed"] = _parse_date(e["date_published"])
-        if "date_updated" in e:
+        if "date_updated" in e and self._wants("updated", "updated_parsed"):
             entry["updated"] = e["date_modified"]
             entry["updated_parsed"] = _parse_date(e["date_modified"])
 
@@ -114,6 +127,9 @@ class JSONParser:
 
         return entry
 
+    def _wants(self, *keys):
+        return self.fields is None or not self.fields.isdisjoint(keys)
+
     @staticmethod
     def parse_author(parent, dest):
         dest["author_detail"] = detail = FeedParserDict()
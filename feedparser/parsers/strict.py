@@ -28,6 +28,13 @@
 
 from ..exceptions import UndeclaredNamespace
 
+# Once a parser has remembered this many element and attribute names,
+# it forgets them when it is reset.
+NAME_CACHE_SIZE = 4096
+
+_MATHML_NAMESPACE = "http://www.w3.org/1998/Math/MathML"
+_SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+
 
 class StrictXMLParser:
     def __init__(self, baseuri, baselang, encoding):
@@ -37,14 +44,54 @@ class StrictXMLParser:
         self.baseuri = baseuri or ""
         self.lang = baselang
         self.encoding = encoding
+        # Where the first and the most recently started entries begin,
+        # as (line, column) pairs; see api._resume_positions().
+        self.entries_started = 0
+        self.first_entry_position = None
+        self.last_entry_position = None
+        # What the SAX names of elements and attributes normalize to;
+        # see the _normalize_*() methods.
+        self._starttag_names = {}
+        self._endtag_names = {}
+        self._attribute_names = {}
+        # The first prefix in namespaces_in_use of each namespace URI,
+        # or None when namespaces_in_use changed since it was built.
+        self._namespace_prefixes = None
         super().__init__()
 
+    def reset(self, baseuri=None, baselang=None, encoding=None):
+        """Forget the last document, so that the parser can read another one.
+
+        All of the parser state is replaced rather than cleared, so that
+        the results that were built from the last document are unaffected.
+        The normalized names are kept, since they don't depend on the document.
+        """
+
+        names = self._starttag_names, self._endtag_names, self._attribute_names
+        self.__dict__.clear()
+        self.__init__(baseuri, baselang, encoding)
+        if sum(len(cache) for cache in names) <= NAME_CACHE_SIZE:
+            self._starttag_names, self._endtag_names, self._attribute_names = names
+
     @staticmethod
     def _normalize_attributes(kv):
         k = kv[0].lower()
         v = k in ("rel", "type") and kv[1].lower() or kv[1]
         return k, v
 
+    def track_namespace(self, prefix, uri):
+        super().track_namespace(prefix, uri)
+        self._namespace_prefixes = None
+
+    def _prefix_for_namespace(self, namespace):
+        prefixes = self._namespace_prefixes
+        if prefixes is None:
+            prefixes = self._namespace_prefixes = {}
+            for name, value in self.namespaces_in_use.items():
+                if name:
+                    prefixes.setdefault(value, name)
+        return prefixes.get(namespace)
+
     def startPrefixMapping(self, prefix, uri):
         if not uri:
             return
@@ -54,7 +101,15 @@ class StrictXMLParser:
         if prefix and uri == "http://www.w3.org/1999/xlink":
             self.decls["xmlns:" + prefix] = uri
 
-    def startElementNS(self, name, qname, attrs):
+    def _normalize_starttag(self, name, qname):
+        """Normalize the name of a start tag.
+
+        Returns a (namespace, localname, tag, givenprefix, xmlns) tuple.
+        *tag* is None if it depends on the prefixes that the document
+        declares; *givenprefix* is set if it must have been declared;
+        and *xmlns* is the namespace to add as an xmlns attribute, if any.
+        """
+
         namespace, localname = name
         lowernamespace = str(namespace or "").lower()
         if lowernamespace.find("backend.userland.com/rss") != -1:
@@ -66,16 +121,18 @@ class StrictXMLParser:
         else:
             givenprefix = None
         prefix = self._matchnamespaces.get(lowernamespace, givenprefix)
-        if (
-            givenprefix
-            and (prefix is None or (prefix == "" and lowernamespace == ""))
-            and givenprefix not in self.namespaces_in_use
+        if not (
+            givenprefix and (prefix is None or (prefix == "" and lowernamespace == ""))
         ):
-            raise UndeclaredNamespace(
-                "'%s' is not associated with a namespace" % givenprefix
-            )
+            givenprefix = None
         localname = str(localname).lower()
 
+        xmlns = None
+        if localname == "math" and namespace == _MATHML_NAMESPACE:
+            xmlns = namespace
+        if localname == "svg" and namespace == _SVG_NAMESPACE:
+            xmlns = namespace
+
         # qname implementation is horribly broken in Python 2.1 (it
         # doesn't report any), and slightly broken in Python 2.2 (it
         # doesn't report the xml: namespace). So we match up namespaces
@@ -83,35 +140,21 @@ class StrictXMLParser:
         # the qnames the SAX parser gives us (if indeed it gives us any
         # at all).  Thanks to MatejC for helping me test this and
         # tirelessly telling me that it didn't work yet.
-        attrsD, self.decls = self.decls, {}
-        if localname == "math" and namespace == "http://www.w3.org/1998/Math/MathML":
-            attrsD["xmlns"] = namespace
-        if localname == "svg" and namespace == "http://www.w3.org/2000/svg":
-            attrsD["xmlns"] = namespace
-
         if prefix:
-            localname = prefix.lower() + ":" + localname
+            tag = (prefix.lower() + ":" + localname).lower()
         elif namespace and not qname:  # Expat
-            for name, value in self.namespaces_in_use.items():
-                if name and value == namespace:
-                    localname = name + ":" + localname
-                    break
-
-        for (namespace, attrlocalname), attrvalue in attrs.items():
-            lowernamespace = (namespace or "").lower()
-            prefix = self._matchnamespaces.get(lowernamespace, "")
-            if prefix:
-                attrlocalname = prefix + ":" + attrlocalname
-            attrsD[str(attrlocalname).lower()] = attrvalue
-        for qname in attrs.getQNames():
-            attrsD[str(qname).lower()] = attrs.getValueByQName(qname)
-        localname = str(localname).lower()
-        self.unknown_starttag(localname, list(attrsD.items()))
+            tag = None
+        else:
+            tag = localname
+        return namespace, localname, tag, givenprefix, xmlns
 
-    def characters(self, text):
-        self.handle_data(text)
+    def _normalize_endtag(self, name, qname):
+        """Normalize the name of an end tag.
+
+        Returns a (namespace, localname, tag) tuple, where *tag* is None
+        if it depends on the prefixes that the document declares.
+        """
 
-    def endElementNS(self, name, qname):
         namespace, localname = name
         lowernamespace = str(namespace or "").lower()
         if qname and qname.find(":") > 0:
@@ -120,14 +163,85 @@ class StrictXMLParser:
             givenprefix = ""
         prefix = self._matchnamespaces.get(lowernamespace, givenprefix)
         if prefix:
-            localname = prefix + ":" + localname
+            tag = str(prefix + ":" + localname).lower()
         elif namespace and not qname:  # Expat
-            for name, value in self.namespaces_in_use.items():
-                if name and value == namespace:
-                    localname = name + ":" + localname
-                    break
-        localname = str(localname).lower()
-        self.unknown_endtag(localname)
+            tag = None
+        else:
+            tag = str(localname).lower()
+        return namespace, localname, tag
+
+    def _normalize_attribute_name(self, name):
+        namespace, localname = name
+        prefix = self._matchnamespaces.get((namespace or "").lower(), "")
+        if prefix:
+            localname = prefix + ":" + localname
+        return str(localname).lower()
+
+    def startElementNS(self, name, qname, attrs):
+        try:
+            normalized = self._starttag_names[name, qname]
+        except KeyError:
+            normalized = self._normalize_starttag(name, qname)
+            self._starttag_names[name, qname] = normalized
+        namespace, localname, tag, givenprefix, xmlns = normalized
+        if givenprefix and givenprefix not in self.namespaces_in_use:
+            raise UndeclaredNamespace(
+                "'%s' is not associated with a namespace" % givenprefix
+            )
+        if tag is None:
+            prefix = self._prefix_for_namespace(namespace)
+            tag = (prefix + ":" + localname).lower() if prefix else localname
+
+        attrsD, self.decls = self.decls, {}
+        decls_seen = bool(attrsD)
+        if xmlns:
+            attrsD["xmlns"] = xmlns
+        if attrs:
+            attribute_names = self._attribute_names
+            items = attrs.items()
+            for attrname, attrvalue in items:
+                try:
+                    attrsD[attribute_names[attrname]] = attrvalue
+                except KeyError:
+                    key = self._normalize_attribute_name(attrname)
+                    attribute_names[attrname] = key
+                    attrsD[key] = attrvalue
+            for attrname, attrvalue in items:
+                attrsD[str(attrs.getQNameByName(attrname)).lower()] = attrvalue
+        if decls_seen:
+            # The declared prefixes may not be in lowercase.
+            attrsD = dict(map(self._normalize_attributes, attrsD.items()))
+        else:
+            for key in ("rel", "type"):
+                if key in attrsD:
+                    attrsD[key] = attrsD[key].lower() or attrsD[key]
+
+        entries = len(self.entries)
+        self._handle_starttag(tag, attrsD, attrsD.items())
+        if len(self.entries) > entries and self._locator is not None:
+            self._record_entry_position()
+
+    def _record_entry_position(self):
+        position = (self._locator.getLineNumber(), self._locator.getColumnNumber())
+        if not self.entries_started:
+            self.first_entry_position = position
+        self.last_entry_position = position
+        self.entries_started += 1
+
+    def characters(self, text):
+        self.handle_data(text)
+
+    def endElementNS(self, name, qname):
+        try:
+            normalized = self._endtag_names[name, qname]
+        except KeyError:
+            normalized = self._normalize_endtag(name, qname)
+            self._endtag_names[name, qname] = normalized
+        namespace, localname, tag = normalized
+        if tag is None:
+            prefix = self._prefix_for_namespace(namespace)
+            tag = str(prefix + ":" + localname if prefix else localname).lower()
+        self.unknown_endtag(tag)
 
     def error(self, exc):
         self.bozo = 1
@@ -0,0 +1,117 @@
+# Copyright 2010-2025 Kurt McKee <contactme@kurtmckee.org>
+# Copyright 2002-2008 Mark Pilgrim
+# All rights reserved.
+#
+# This file is a part of feedparser.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice,
+#   this list of conditions and the following disclaimer.
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS 'AS IS'
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Remember how each feed was parsed, so it can be parsed faster next time."""
+
+from __future__ import annotations
+
+import collections
+import threading
+
+# How many feeds a ProfileCache remembers by default.
+PROFILE_CACHE_SIZE = 1024
+
+# How often the hints in a profile are ignored by default,
+# so that changes to the feed (for example, a fixed error) are noticed.
+REVALIDATE_EVERY = 32
+
+
+class ParseProfile:
+    """What was learned about a feed the last time it was parsed."""
+
+    __slots__ = ("encoding", "uses")
+
+    def __init__(self, encoding: str | None = None):
+        # The character encoding that the feed was decoded with.
+        self.encoding = encoding
+        self.uses = 0
+
+    def __repr__(self):
+        return f"ParseProfile(encoding={self.encoding!r})"
+
+
+class ProfileCache:
+    """A bounded, thread-safe cache of parse profiles, keyed by feed URL.
+
+    When a feed that is in the cache is requested again, the character
+    encoding that was detected is tried first. If it doesn't work,
+    the usual detection takes over.
+
+    At most *maxsize* feeds are remembered; the least recently used
+    is forgotten first. Every *revalidate_every* parses of a feed,
+    the hints are ignored and the profile is learned again.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = PROFILE_CACHE_SIZE,
+        revalidate_every: int = REVALIDATE_EVERY,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if revalidate_every < 1:
+            raise ValueError("revalidate_every must be at least 1")
+        self.maxsize = maxsize
+        self.revalidate_every = revalidate_every
+        self._profiles: collections.OrderedDict[str, ParseProfile] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, href: str) -> ParseProfile | None:
+        """Return the profile to use for *href*, if its hints should be used."""
+
+        with self._lock:
+            profile = self._profiles.get(href)
+            if profile is None:
+                return None
+            self._profiles.move_to_end(href)
+            profile.uses += 1
+            if profile.uses % self.revalidate_every == 0:
+                return None
+            return profile
+
+    def put(self, href: str, profile: ParseProfile) -> None:
+        """Remember *profile* for *href*."""
+
+        with self._lock:
+            previous = self._profiles.pop(href, None)
+            if previous is not None:
+                profile.uses = previous.uses
+            self._profiles[href] = profile
+            if len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, href: object) -> bool:
+        return href in self._profiles
@@ -27,10 +27,33 @@
 
 from __future__ import annotations
 
+import collections
+import collections.abc
+import html.entities
+import operator
 import re
+import sys
+import threading
+import types
+import typing
 
 from .html import BaseHTMLProcessor
-from .urls import make_safe_absolute_uri
+from .urls import RelativeURIResolver, make_safe_absolute_uri, resolve_relative_uris
+
+# How many distinct style attribute values are remembered once sanitized.
+STYLE_CACHE_SIZE = 1024
+
+# Sanitized style values, keyed by (policy, style, whether in SVG).
+_clean_styles: dict[tuple[SanitizerPolicy, str, bool], str] = {}
+
+_CSS_URL = re.compile(r"url\s*\(\s*[^\s)]+?\s*\)\s*")
+_CSS_GAUNTLET = re.compile(
+    r"""^([:,;#%.\sa-zA-Z0-9!]|\w-\w|'[\s\w]+'|"[\s\w]+"|\([\d,\s]+\))*$"""
+)
+_CSS_DECLARATION = re.compile(r"\s*([-\w]+)\s*:\s*([^:;]*);?")
+# Properties whose values are checked keyword by keyword.
+_CSS_SHORTHAND_PROPERTIES = frozenset({"background", "border", "margin", "padding"})
+_COMMENT_END = re.compile(r"--[^>]*>")
 
 
 class HTMLSanitizer(BaseHTMLProcessor):
@@ -722,9 +745,6 @@ class HTMLSanitizer(BaseHTMLProcessor):
         "zoomAndPan",
     }
 
-    svg_attr_map = None
-    svg_elem_map = None
-
     acceptable_svg_properties = {
         "fill",
         "fill-opacity",
@@ -736,9 +756,12 @@ class HTMLSanitizer(BaseHTMLProcessor):
         "stroke-width",
     }
 
-    def __init__(self, encoding=None, _type="application/xhtml+xml"):
+    def __init__(self, encoding=None, _type="application/xhtml+xml", policy=None):
         super().__init__(encoding, _type)
 
+        if policy is None:
+            policy = self._default_policy()
+        self.policy = policy
         self.unacceptablestack = 0
         self.mathmlOK = 0
         self.svgOK = 0
@@ -749,11 +772,32 @@ class HTMLSanitizer(BaseHTMLProcessor):
         self.mathmlOK = 0
         self.svgOK = 0
 
+    @classmethod
+    def _default_policy(cls):
+        """Return the policy that the class attributes describe.
+
+        It is built again when one of the attributes is replaced,
+        or when names are added to or removed from it.
+        """
+
+        allowlists = tuple(
+            names if isinstance(names, collections.abc.Set) else frozenset(names)
+            for names in _get_policy_attributes(cls)
+        )
+        cached = _class_policies.get(cls)
+        # Sets compare equal to the frozensets that they were copied into.
+        if cached is None or cached[0] != allowlists:
+            snapshot = tuple(map(frozenset, allowlists))
+            policy = SanitizerPolicy(**dict(zip(_POLICY_ATTRIBUTES, snapshot)))
+            cached = _class_policies[cls] = (snapshot, policy)
+        return cached[1]
+
     def unknown_starttag(self, tag, attrs):
-        acceptable_attributes = self.acceptable_attributes
+        policy = self.policy
+        acceptable_attributes = policy.acceptable_attributes
         keymap = {}
-        if tag not in self.acceptable_elements or self.svgOK:
-            if tag in self.unacceptable_elements_with_end_tag:
+        if tag not in policy.acceptable_elements or self.svgOK:
+            if tag in policy.unacceptable_elements_with_end_tag:
                 self.unacceptablestack += 1
 
             # add implicit namespaces to html5 inline svg/mathml
@@ -774,25 +818,15 @@ class HTMLSanitizer(BaseHTMLProcessor):
                 self.svgOK += 1
 
             # chose acceptable attributes based on tag class, else bail
-            if self.mathmlOK and tag in self.mathml_elements:
-                acceptable_attributes = self.mathml_attributes
-            elif self.svgOK and tag in self.svg_elements:
+            if self.mathmlOK and tag in policy.mathml_elements:
+                acceptable_attributes = policy.mathml_attributes
+            elif self.svgOK and tag in policy.svg_elements:
                 # For most vocabularies, lowercasing is a good idea. Many
                 # svg elements, however, are camel case.
-                if not self.svg_attr_map:
-                    lower = [attr.lower() for attr in self.svg_attributes]
-                    mix = [a for a in self.svg_attributes if a not in lower]
-                    self.svg_attributes = lower
-                    self.svg_attr_map = {a.lower(): a for a in mix}
-
-                    lower = [attr.lower() for attr in self.svg_elements]
-                    mix = [a for a in self.svg_elements if a not in lower]
-                    self.svg_elements = lower
-                    self.svg_elem_map = {a.lower(): a for a in mix}
-                acceptable_attributes = self.svg_attributes
-                tag = self.svg_elem_map.get(tag, tag)
-                keymap = self.svg_attr_map
-            elif tag not in self.acceptable_elements:
+                acceptable_attributes = policy.svg_attributes
+                tag = policy.svg_elem_map.get(tag, tag)
+                keymap = policy.svg_attr_map
+            elif tag not in policy.acceptable_elements:
                 return
 
         # declare xlink namespace, if needed
@@ -816,14 +850,15 @@ class HTMLSanitizer(BaseHTMLProcessor):
         super().unknown_starttag(tag, clean_attrs)
 
     def unknown_endtag(self, tag):
-        if tag not in self.acceptable_elements:
-            if tag in self.unacceptable_elements_with_end_tag:
+        policy = self.policy
+        if tag not in policy.acceptable_elements:
+            if tag in policy.unacceptable_elements_with_end_tag:
                 self.unacceptablestack -= 1
-            if self.mathmlOK and tag in self.mathml_elements:
+            if self.mathmlOK and tag in policy.mathml_elements:
                 if tag == "math" and self.mathmlOK:
                     self.mathmlOK -= 1
-            elif self.svgOK and tag in self.svg_elements:
-                tag = self.svg_elem_map.get(tag, tag)
+            elif self.svgOK and tag in policy.svg_elements:
+                tag = policy.svg_elem_map.get(tag, tag)
                 if tag == "svg" and self.svgOK:
                     self.svgOK -= 1
             else:
@@ -841,41 +876,53 @@ class HTMLSanitizer(BaseHTMLProcessor):
             super().handle_data(text)
 
     def sanitize_style(self, style):
+        key = self.policy, style, bool(self.svgOK)
+        clean = _clean_styles.get(key)
+        if clean is None:
+            if len(_clean_styles) >= STYLE_CACHE_SIZE:
+                _clean_styles.clear()
+            clean = _clean_styles[key] = self._sanitize_style(style)
+        return clean
+
+    def _sanitize_style(self, style):
         # disallow urls
-        style = re.compile(r"url\s*\(\s*[^\s)]+?\s*\)\s*").sub(" ", style)
+        style = _CSS_URL.sub(" ", style)
 
         # gauntlet
-        if not re.match(
-            r"""^([:,;#%.\sa-zA-Z0-9!]|\w-\w|'[\s\w]+'|"[\s\w]+"|\([\d,\s]+\))*$""",
-            style,
-        ):
+        if not _CSS_GAUNTLET.match(style):
             return ""
-        # This replaced a regexp that used re.match and was prone to
-        # pathological back-tracking.
-        if re.sub(r"\s*[-\w]+\s*:\s*[^:;]*;?", "", style).strip():
+
+        # Read the declarations one after the other; anything but whitespace
+        # between or after them means that the style is rejected. This replaced
+        # a regexp that used re.match and was prone to pathological back-tracking.
+        declarations = []
+        position = 0
+        match = _CSS_DECLARATION.match(style)
+        while match is not None:
+            declarations.append(match.groups())
+            position = match.end()
+            match = _CSS_DECLARATION.match(style, position)
+        if style[position:].strip():
             return ""
 
+        policy = self.policy
         clean = []
-        for prop, value in re.findall(r"([-\w]+)\s*:\s*([^:;]*)", style):
+        for prop, value in declarations:
             if not value:
                 continue
-            if prop.lower() in self.acceptable_css_properties:
+            lower_prop = prop.lower()
+            if lower_prop in policy.acceptable_css_properties:
                 clean.append(prop + ": " + value + ";")
-            elif prop.split("-")[0].lower() in [
-                "background",
-                "border",
-                "margin",
-                "padding",
-            ]:
+            elif lower_prop.split("-")[0] in _CSS_SHORTHAND_PROPERTIES:
                 for keyword in value.split():
                     if (
-                        keyword not in self.acceptable_css_keywords
+                        keyword not in policy.acceptable_css_keywords
                         and not self.valid_css_values.match(keyword)
                     ):
                         break
                 else:
                     clean.append(prop + ": " + value + ";")
-            elif self.svgOK and prop.lower() in self.acceptable_svg_properties:
+            elif self.svgOK and lower_prop in policy.acceptable_svg_properties:
                 clean.append(prop + ": " + value + ";")
 
         return " ".join(clean)
@@ -886,17 +933,306 @@ class HTMLSanitizer(BaseHTMLProcessor):
             return ret
         # if ret == -1, this may be a malicious attempt to circumvent
         # sanitization, or a page-destroying unclosed comment
-        match = re.compile(r"--[^>]*>").search(self.rawdata, i + 4)
+        match = _COMMENT_END.search(self.rawdata, i + 4)
         if match:
             return match.end()
+        if not self._closing:
+            # wait for more data
+            return -1
         # unclosed comment; deliberately fail to handle_data()
         return len(self.rawdata)
 
 
-def sanitize_html(html_source, encoding, _type):
-    p = HTMLSanitizer(encoding, _type)
-    html_source = html_source.replace("<![CDATA[", "&lt;![CDATA[")
-    p.feed(html_source)
+# The HTMLSanitizer attributes that a SanitizerPolicy is made of.
+_POLICY_ATTRIBUTES = (
+    "acceptable_elements",
+    "acceptable_attributes",
+    "unacceptable_elements_with_end_tag",
+    "acceptable_css_properties",
+    "acceptable_css_keywords",
+    "acceptable_svg_properties",
+    "mathml_elements",
+    "mathml_attributes",
+    "svg_elements",
+    "svg_attributes",
+)
+_get_policy_attributes = operator.attrgetter(*_POLICY_ATTRIBUTES)
+
+
+class SanitizerPolicy:
+    """An immutable description of the markup that the sanitizer keeps.
+
+    Each keyword argument is one of the allowlists of :class:`HTMLSanitizer`,
+    such as ``acceptable_elements`` or ``acceptable_css_properties``,
+    and defaults to the sanitizer's. The names are stored in frozensets,
+    and the camel-cased SVG names are mapped from their lowercase forms
+    up front, so a policy can be shared between sanitizers and threads.
+    """
+
+    __slots__ = _POLICY_ATTRIBUTES + ("svg_elem_map", "svg_attr_map")
+
+    def __init__(self, **allowlists: typing.Iterable[str]):
+        for name in allowlists:
+            if name not in _POLICY_ATTRIBUTES:
+                raise TypeError(f"unexpected keyword argument {name!r}")
+        for name in _POLICY_ATTRIBUTES:
+            names = allowlists.get(name)
+            if names is None:
+                names = getattr(HTMLSanitizer, name)
+            object.__setattr__(self, name, frozenset(names))
+
+        # For most vocabularies, lowercasing is a good idea. Many
+        # svg elements and attributes, however, are camel case.
+        for names, case_map in (
+            ("svg_elements", "svg_elem_map"),
+            ("svg_attributes", "svg_attr_map"),
+        ):
+            mixed = {name.lower(): name for name in getattr(self, names)}
+            object.__setattr__(self, names, frozenset(mixed))
+            object.__setattr__(
+                self,
+                case_map,
+                types.MappingProxyType(
+                    {lower: name for lower, name in mixed.items() if lower != name}
+                ),
+            )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SanitizerPolicy objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("SanitizerPolicy objects are immutable")
+
+
+# The policies that HTMLSanitizer and its subclasses describe with their
+# attributes, with a copy of the names that they were built from.
+_class_policies: dict[type, tuple[tuple, SanitizerPolicy]] = {}
+
+
+class _ResolvingHTMLSanitizer(HTMLSanitizer):
+    """Resolve relative URIs and sanitize markup in a single parse.
+
+    The output is the same as that of RelativeURIResolver followed by
+    HTMLSanitizer. The sanitizer sees each start tag's attributes the way
+    that it would have read them back from the resolver's output.
+    """
+
+    relative_uris = RelativeURIResolver.relative_uris
+    resolve_uri = RelativeURIResolver.resolve_uri
+
+    def __init__(self, baseuri, encoding, _type, policy=None):
+        super().__init__(encoding, _type, policy)
+        self.baseuri = baseuri
+        # The empty element that was just started, if nothing followed it.
+        self.last_empty_tag = None
+
+    def unknown_starttag(self, tag, attrs):
+        attrs = [
+            (
+                key,
+                self._escape_attribute(
+                    ((tag, key) in self.relative_uris)
+                    and self.resolve_uri(value)
+                    or value
+                ),
+            )
+            for key, value in self.normalize_attrs(attrs)
+        ]
+        super().unknown_starttag(tag, attrs)
+        # The resolver writes empty elements as "<tag />",
+        # which ends them when the markup is XHTML.
+        if tag in self.elements_no_end_tag:
+            if self._type == "application/xhtml+xml":
+                super().unknown_endtag(tag)
+            self.last_empty_tag = tag
+        else:
+            self.last_empty_tag = None
+
+    def unknown_endtag(self, tag):
+        # The resolver doesn't write the end tags of empty elements,
+        # which joins the text around them unless they follow the start tag.
+        if tag not in self.elements_no_end_tag:
+            super().unknown_endtag(tag)
+        elif tag != self.last_empty_tag:
+            raise _NeedsSeparateParses
+        self.last_empty_tag = None
+
+    def handle_entityref(self, ref):
+        if ref in html.entities.name2codepoint or ref == "apos":
+            super().handle_entityref(ref)
+        else:
+            # The resolver writes "&amp;" followed by the name as text.
+            super().handle_entityref("amp")
+            self.handle_data(ref)
+
+    def handle_data(self, text):
+        # Text that the resolver writes as-is might be read back as markup.
+        if "<" in text:
+            raise _NeedsSeparateParses
+        self.last_empty_tag = None
+        super().handle_data(text)
+
+
+class _NeedsSeparateParses(Exception):
+    pass
+
+
+# The markup that _ResolvingHTMLSanitizer can't handle exactly like
+# two separate parses, because the resolver's output would be read
+# differently from the original: CDATA sections, which sanitize_html()
+# escapes before parsing, and comments that are never closed.
+_COMMENT_CLOSE = re.compile(r"--\s*>")
+
+
+def _can_resolve_while_sanitizing(html_source):
+    if "<![CDATA[" in html_source:
+        return False
+    comment_start = html_source.rfind("<!--")
+    return comment_start == -1 or bool(
+        _COMMENT_CLOSE.search(html_source, comment_start + 4)
+    )
+
+
+# How many fragments a SanitizerCache remembers by default.
+SANITIZER_CACHE_SIZE = 4096
+
+# How much memory the fragments in a SanitizerCache may use by default, in bytes.
+SANITIZER_CACHE_BYTES = 2**25
+
+
+class SanitizerCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    entries: int
+    maxsize: int
+    bytes: int
+    maxbytes: int
+
+
+class SanitizerCache:
+    """A bounded, thread-safe cache of sanitized markup.
+
+    Markup that was already sanitized, with the same base URI,
+    content type, and policy, is not parsed again; this helps when the same
+    feeds are parsed repeatedly and most of their entries haven't changed.
+
+    At most *maxsize* fragments are remembered, and at most *maxbytes*
+    bytes of markup and sanitized output, as measured by
+    :func:`sys.getsizeof`; the least recently used is forgotten first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SANITIZER_CACHE_SIZE,
+        maxbytes: int = SANITIZER_CACHE_BYTES,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if maxbytes < 1:
+            raise ValueError("maxbytes must be at least 1")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._fragments: collections.OrderedDict[tuple, tuple[str, int]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str | None:
+        """Return the sanitized markup for *key*, if it is remembered."""
+
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._fragments.move_to_end(key)
+            self.hits += 1
+            return fragment[0]
+
+    def put(self, key: tuple, output: str) -> None:
+        """Remember that the markup in *key* was sanitized to *output*."""
+
+        size = sys.getsizeof(key[0]) + sys.getsizeof(output)
+        if size > self.maxbytes:
+            return
+        with self._lock:
+            previous = self._fragments.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._fragments[key] = (output, size)
+            self.bytes += size
+            while len(self._fragments) > self.maxsize or self.bytes > self.maxbytes:
+                _, (_, forgotten) = self._fragments.popitem(last=False)
+                self.bytes -= forgotten
+
+    def info(self) -> SanitizerCacheInfo:
+        """Return how often the cache was used, and how full it is."""
+
+        with self._lock:
+            return SanitizerCacheInfo(
+                self.hits,
+                self.misses,
+                len(self._fragments),
+                self.maxsize,
+                self.bytes,
+                self.maxbytes,
+            )
+
+    def clear(self) -> None:
+        """Forget all of the fragments and reset the statistics."""
+
+        with self._lock:
+            self._fragments.clear()
+            self.hits = self.misses = self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+def sanitize_html(html_source, encoding, _type, base_uri=None, cache=None, policy=None):
+    """Remove unsafe elements, attributes, and styles from markup.
+
+    If *base_uri* is given, relative URIs are first resolved against it,
+    as :func:`~feedparser.urls.resolve_relative_uris` would resolve them,
+    in the same parse whenever possible.
+
+    If *cache* is a :class:`SanitizerCache`, the output is looked up
+    in it first, and remembered in it otherwise.
+
+    *policy* is the :class:`SanitizerPolicy` that decides what is kept;
+    it defaults to the one that the :class:`HTMLSanitizer` attributes describe.
+    """
+
+    if policy is None:
+        policy = HTMLSanitizer._default_policy()
+    if cache is not None:
+        key = (html_source, base_uri, _type, encoding, policy)
+        data = cache.get(key)
+        if data is None:
+            data = _sanitize_html(html_source, encoding, _type, base_uri, policy)
+            cache.put(key, data)
+        return data
+    return _sanitize_html(html_source, encoding, _type, base_uri, policy)
+
+
+def _sanitize_html(html_source, encoding, _type, base_uri, policy):
+    if base_uri is not None and _can_resolve_while_sanitizing(html_source):
+        p = _ResolvingHTMLSanitizer(base_uri, encoding, _type, policy)
+        try:
+            p.feed(html_source)
+        except _NeedsSeparateParses:
+            p = None
+    else:
+        p = None
+    if p is None:
+        if base_uri is not None:
+            html_source = resolve_relative_uris(html_source, base_uri, encoding, _type)
+        p = HTMLSanitizer(encoding, _type, policy)
+        html_source = html_source.replace("<![CDATA[", "&lt;![CDATA[")
+        p.feed(html_source)
     data = p.output()
     data = data.strip().replace("\r\n", "\n")
     return data
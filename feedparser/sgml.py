@@ -30,22 +30,26 @@ import re
 import feedparser_sgmllib as sgmllib
 
 __all__ = [
+    "endbracket",
     "sgmllib",
 ]
 
+# Overriding the built-in sgmllib.endbracket regex allows the
+# parser to find angle brackets embedded in element attributes.
+# The end of a match is where the tag ends.
+endbracket: re.Pattern[str] = re.compile(
+    r"("
+    r"""[^'"<>]"""
+    r"""|"[^"]*"(?=>|/|\s|\w+=)"""
+    r"""|'[^']*'(?=>|/|\s|\w+=))*(?=[<>])"""
+    r"""|.*?(?=[<>]"""
+    r")"
+)
+
 
 class _EndBracketRegEx:
     def __init__(self):
-        # Overriding the built-in sgmllib.endbracket regex allows the
-        # parser to find angle brackets embedded in element attributes.
-        self.endbracket = re.compile(
-            r"("
-            r"""[^'"<>]"""
-            r"""|"[^"]*"(?=>|/|\s|\w+=)"""
-            r"""|'[^']*'(?=>|/|\s|\w+=))*(?=[<>])"""
-            r"""|.*?(?=[<>]"""
-            r")"
-        )
+        self.endbracket = endbracket
 
     def search(self, target, index=0):
         match = self.endbracket.match(target, index)
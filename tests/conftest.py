@@ -12,6 +12,23 @@ def use_loose_parser(monkeypatch):
     yield
 
 
+@pytest.fixture
+def use_expat_driver(monkeypatch):
+    import feedparser.api
+
+    drivers = ["feedparser.parsers.expat"]
+    monkeypatch.setattr(feedparser.api, "PREFERRED_XML_PARSERS", drivers)
+    yield
+
+
+@pytest.fixture
+def use_sgmllib_tokenizer(monkeypatch):
+    import feedparser.html
+
+    monkeypatch.setattr(feedparser.html, "HTML_TOKENIZER", "sgmllib")
+    yield
+
+
 @pytest.fixture(scope="session", autouse=True)
 def mock_responses():
     responses.start()
@@ -0,0 +1,89 @@
+import asyncio
+import concurrent.futures
+import io
+
+import pytest
+import responses
+
+import feedparser
+
+feed_xml = b"""
+    <rss version="2.0">
+        <channel>
+            <title>Example</title>
+            <item><title>Item</title></item>
+        </channel>
+    </rss>
+"""
+
+
+def test_aparse_stream():
+    result = asyncio.run(feedparser.aparse(io.BytesIO(feed_xml)))
+    assert result.bozo is False
+    assert result.feed.title == "Example"
+    assert result.entries[0].title == "Item"
+
+
+def test_aparse_matches_parse():
+    expected = feedparser.parse(feed_xml)
+    actual = asyncio.run(feedparser.aparse(feed_xml))
+    assert actual == expected
+
+
+def test_aparse_negative_max_entries():
+    with pytest.raises(ValueError):
+        asyncio.run(feedparser.aparse(feed_xml, max_entries=-1))
+
+
+def test_aparse_url():
+    url = "http://127.0.0.1:8097/aparse.xml"
+    responses.get(
+        url,
+        body=feed_xml,
+        content_type="application/rss+xml",
+        headers={"ETag": '"abc"'},
+    )
+    result = asyncio.run(feedparser.aparse(url))
+    assert result.status == 200
+    assert result.href == url
+    assert result.etag == '"abc"'
+    assert result.headers["content-type"] == "application/rss+xml"
+    assert result.entries[0].title == "Item"
+
+
+def test_aparse_custom_executor():
+    async def run():
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            return await feedparser.aparse(feed_xml, executor=executor)
+
+    assert asyncio.run(run()).entries[0].title == "Item"
+
+
+def test_aparse_many():
+    sources = [feed_xml.replace(b"Item", b"Item %d" % i) for i in range(5)]
+
+    async def run():
+        return [pair async for pair in feedparser.aparse_many(sources, limit=2)]
+
+    results = asyncio.run(run())
+    assert sorted(source for source, _ in results) == sorted(sources)
+    for source, result in results:
+        assert result.entries[0].title == feedparser.parse(source).entries[0].title
+
+
+def test_aparse_many_consumes_sources_lazily():
+    consumed = []
+
+    def sources():
+        for _ in range(100):
+            consumed.append(None)
+            yield feed_xml
+
+    async def run():
+        results = feedparser.aparse_many(sources(), limit=3)
+        async for _ in results:
+            break
+        await results.aclose()
+
+    asyncio.run(run())
+    assert len(consumed) <= 3
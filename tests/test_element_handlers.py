@@ -0,0 +1,111 @@
+import feedparser
+import feedparser.api
+import feedparser.mixin
+
+
+def test_handlers_added_after_import_are_used(monkeypatch):
+    def _start_rating(self, attrs_d):
+        self.push("rating", 1)
+
+    def _end_rating(self):
+        self._get_context()["rating"] = int(self.pop("rating"))
+
+    monkeypatch.setattr(
+        feedparser.api.StrictFeedParser, "_start_rating", _start_rating, raising=False
+    )
+    monkeypatch.setattr(
+        feedparser.api.StrictFeedParser, "_end_rating", _end_rating, raising=False
+    )
+    result = feedparser.parse("<rss><channel><rating>5</rating></channel></rss>")
+    assert result.feed.rating == 5
+
+
+def test_replaced_handlers_are_used(monkeypatch):
+    def _end_title(self):
+        self._get_context()["title"] = self.pop("title").upper()
+
+    monkeypatch.setattr(feedparser.mixin.XMLParserMixin, "_end_title", _end_title)
+    result = feedparser.parse("<rss><channel><title>t</title></channel></rss>")
+    assert result.feed.title == "T"
+
+
+def test_subclass_handlers_are_used():
+    class FeedParser(feedparser.api.StrictFeedParser):
+        def _start_rating(self, attrs_d):
+            self.push("rating", 1)
+
+        def _end_rating(self):
+            self._get_context()["rating"] = int(self.pop("rating"))
+
+    feed_parser = FeedParser("", None, "utf-8")
+    feed_parser.unknown_starttag("channel", [])
+    feed_parser.unknown_starttag("rating", [])
+    feed_parser.handle_data("5")
+    feed_parser.unknown_endtag("rating")
+    assert feed_parser.feeddata["rating"] == 5
+
+
+def test_attributes_are_not_handlers():
+    class FeedParser(feedparser.api.StrictFeedParser):
+        _start_handlers = {}
+        _end_handlers = {}
+
+    feed_parser = FeedParser("", None, "utf-8")
+    feed_parser.unknown_starttag("channel", [])
+    feed_parser.unknown_starttag("handlers", [])
+    feed_parser.handle_data("x")
+    feed_parser.unknown_endtag("handlers")
+    assert feed_parser.feeddata["handlers"] == "x"
+
+
+handlers_xml = "<rss><channel><handlers>x</handlers><title>t</title></channel></rss>"
+
+
+def test_handlers_element():
+    result = feedparser.parse(handlers_xml)
+    assert result.bozo is False
+    assert result.feed.handlers == "x"
+    assert result.feed.title == "t"
+
+
+def test_handlers_element_loose(use_loose_parser):
+    result = feedparser.parse(handlers_xml)
+    assert result.feed.handlers == "x"
+    assert result.feed.title == "t"
+
+
+def test_handler_attribute_error_falls_back_to_default():
+    class FeedParser(feedparser.api.StrictFeedParser):
+        def _start_rating(self, attrs_d):
+            raise AttributeError
+
+    feed_parser = FeedParser("", None, "utf-8")
+    feed_parser.unknown_starttag("channel", [])
+    feed_parser.unknown_starttag("rating", [("value", "5")])
+    assert feed_parser.feeddata["rating"] == {"value": "5"}
+
+
+def test_namespace_prefixes_follow_declarations():
+    data = b"""<rss xmlns:a="http://one/"><channel>
+        <a:x>1</a:x>
+        <b:y xmlns:b="http://one/">2</b:y>
+        <c:z xmlns:c="http://two/">3</c:z>
+    </channel></rss>"""
+    result = feedparser.parse(data)
+    assert result.feed.a_x == "1"
+    assert result.feed.a_y == "2"
+    assert result.feed.c_z == "3"
+    assert result.namespaces == {
+        "a": "http://one/",
+        "b": "http://one/",
+        "c": "http://two/",
+    }
+
+
+def test_element_names_are_kept_across_resets():
+    feed_parser = feedparser.api.StrictFeedParser("", None, "utf-8")
+    feed_parser.startElementNS((None, "rss"), None, {})
+    names = feed_parser._starttag_names
+    feed_parser.reset()
+    assert feed_parser._starttag_names is names
+    assert ((None, "rss"), None) in names
@@ -1,5 +1,6 @@
 import codecs
 import glob
+import io
 import os
 
 import pytest
@@ -194,3 +195,29 @@ def test_encoding(encoding):
     result = feedparser.parse(data.strip().encode(encoding))
     assert result["encoding"] == encoding
     assert result["feed"]["title"] == expected
+
+
+def test_encoding_is_checked_while_parsing(monkeypatch):
+    def fail(*args):
+        raise AssertionError("the file was decoded before parsing it")
+
+    monkeypatch.setattr(feedparser.encodings, "_validate_buffer", fail)
+    data = b"<rss><channel><title>\xe2\x98\x95</title></channel></rss>"
+    result = feedparser.parse(io.BytesIO(data))
+    assert result["feed"]["title"] == "☕"
+
+
+@pytest.mark.parametrize("loose", (False, True))
+def test_parsing_starts_over_if_the_encoding_is_wrong(loose, monkeypatch):
+    if loose:
+        monkeypatch.setattr(feedparser.api, "_XML_AVAILABLE", False)
+    padding = b"<description>" + b"x" * feedparser.encodings.CONVERT_FILE_PREFIX_LEN
+    data = (
+        b'<?xml version="1.0" encoding="utf-8"?><rss><channel>'
+        + padding
+        + b"</description><title>caf\xe9</title></channel></rss>"
+    )
+    result = feedparser.parse(io.BytesIO(data))
+    assert result["encoding"] == "windows-1252"
+    assert isinstance(result["bozo_exception"], feedparser.CharacterEncodingOverride)
+    assert result["feed"]["title"] == "caf\xe9"
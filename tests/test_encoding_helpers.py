@@ -1,4 +1,5 @@
 import io
+import pathlib
 
 import pytest
 
@@ -65,13 +66,35 @@ def test_convert_file_to_utf8_decode_error_fallback():
         headers, io.BytesIO(data), actual_result
     )
 
-    assert factory.get_binary_file().read() == expected_output
+    assert factory.get_text_file().read() == expected_output.decode("utf-8")
     assert actual_result["encoding"] == expected_result["encoding"]
     assert isinstance(
         actual_result["bozo_exception"], type(expected_result["bozo_exception"])
     )
 
 
+class WithoutSeekable:
+    """A seekable file without seekable(), like SpooledTemporaryFile before 3.11."""
+
+    def __init__(self, data):
+        self._file = io.BytesIO(data)
+        self.read = self._file.read
+        self.seek = self._file.seek
+        self.tell = self._file.tell
+
+
+def test_convert_file_to_utf8_without_seekable_method():
+    data = b"abcd" * feedparser.encodings.CONVERT_FILE_PREFIX_LEN + b"\xff"
+    expected_result = {}
+    expected_output = feedparser.encodings.convert_to_utf8({}, data, expected_result)
+    actual_result = {}
+    factory = feedparser.encodings.convert_file_to_utf8(
+        {}, WithoutSeekable(data), actual_result
+    )
+    assert factory.get_text_file().read() == expected_output.decode("utf-8")
+    assert actual_result["encoding"] == expected_result["encoding"]
+
+
 def _make_file(data):
     return io.BytesIO(data)
 
@@ -209,3 +232,45 @@ def test_convert_file_to_utf8(headers, length):
 
     actual_result.pop("bozo_exception", None)
     assert actual_result == expected_result
+
+
+encoding_paths = sorted(
+    str(path)
+    for directory in ("encoding", "illformed/chardet")
+    for path in pathlib.Path(__file__).parent.joinpath(directory).glob("*.xml")
+)
+
+
+@pytest.mark.parametrize("path", encoding_paths)
+@pytest.mark.parametrize("headers", ({}, {"content-type": "text/xml"}))
+def test_convert_file_to_utf8_without_optimistic_detection(path, headers):
+    data = pathlib.Path(path).read_bytes()
+    expected_result = {}
+    expected_output = feedparser.encodings.convert_to_utf8(
+        headers, data, expected_result
+    )
+
+    actual_result = {}
+    factory = feedparser.encodings.convert_file_to_utf8(
+        headers, io.BytesIO(data), actual_result, optimistic_encoding_detection=False
+    )
+
+    if expected_result["encoding"]:
+        assert factory.get_text_file().read() == expected_output.decode("utf-8")
+    else:
+        assert factory.get_binary_file().read() == expected_output
+    assert repr(actual_result.pop("bozo_exception", None)) == repr(
+        expected_result.pop("bozo_exception", None)
+    )
+    assert actual_result == expected_result
+
+
+def test_convert_file_to_utf8_without_validation():
+    data = b"abcd" * feedparser.encodings.CONVERT_FILE_PREFIX_LEN + b"\xff"
+    result = {}
+    factory = feedparser.encodings.convert_file_to_utf8(
+        {}, io.BytesIO(data), result, validate=False
+    )
+    assert result["encoding"] == "utf-8"
+    with pytest.raises(UnicodeDecodeError):
+        factory.get_text_file().read()
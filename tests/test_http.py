@@ -0,0 +1,221 @@
+import datetime
+import gzip
+import io
+import time
+
+import pytest
+import responses
+import responses.matchers
+
+import feedparser
+import feedparser.http
+
+feed_xml = b"""<rss version="2.0"><channel><title>Example</title></channel></rss>"""
+
+
+def test_etag_is_sent():
+    url = "http://127.0.0.1:8097/etag.xml"
+    responses.get(
+        url,
+        status=304,
+        match=[responses.matchers.header_matcher({"If-None-Match": '"abc"'})],
+    )
+    result = feedparser.parse(url, etag='"abc"')
+    assert result.status == 304
+    assert result.bozo is False
+    assert result.feed == {}
+    assert result.entries == []
+    assert "debug_message" in result
+
+
+def test_modified_is_sent():
+    url = "http://127.0.0.1:8097/modified.xml"
+    modified = "Fri, 11 Jun 2004 23:00:34 GMT"
+    responses.get(
+        url,
+        status=304,
+        match=[responses.matchers.header_matcher({"If-Modified-Since": modified})],
+    )
+    result = feedparser.parse(url, modified=modified)
+    assert result.status == 304
+    assert result.entries == []
+
+
+def test_unconditional_request_sends_no_validators():
+    url = "http://127.0.0.1:8097/unconditional.xml"
+    responses.get(url, body=feed_xml, content_type="application/rss+xml")
+    result = feedparser.parse(url)
+    request_headers = responses.calls[-1].request.headers
+    assert "If-None-Match" not in request_headers
+    assert "If-Modified-Since" not in request_headers
+    assert result.status == 200
+    assert result.feed.title == "Example"
+
+
+@pytest.mark.parametrize(
+    "modified",
+    (
+        "Fri, 11 Jun 2004 23:00:34 GMT",
+        datetime.datetime(2004, 6, 11, 23, 0, 34),
+        datetime.datetime(2004, 6, 11, 23, 0, 34, tzinfo=datetime.timezone.utc),
+        time.strptime("2004-06-11 23:00:34", "%Y-%m-%d %H:%M:%S"),
+        (2004, 6, 11, 23, 0, 34, 4, 163, 0),
+    ),
+)
+def test_format_http_date(modified):
+    expected = "Fri, 11 Jun 2004 23:00:34 GMT"
+    assert feedparser.http._format_http_date(modified) == expected
+
+
+def test_conditional_arguments_ignored_for_streams():
+    result = feedparser.parse(io.BytesIO(feed_xml), etag='"abc"', modified="x")
+    assert result.feed.title == "Example"
+
+
+class StandInResponse:
+    def __init__(self, url, body):
+        self.url = url
+        self.status_code = 200
+        self.headers = {"Content-Type": "application/rss+xml"}
+        self.body = body
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i : i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+class StandInSession:
+    """Record requests and answer them without any network I/O."""
+
+    def __init__(self, body):
+        self.body = body
+        self.calls = []
+
+    def get(self, url, headers, timeout, stream):
+        self.calls.append((url, headers, timeout))
+        self.response = StandInResponse(url, self.body)
+        return self.response
+
+
+def test_injected_session():
+    session = StandInSession(feed_xml)
+    url = "http://127.0.0.1:8097/stand-in.xml"
+    result = feedparser.parse(url, session=session, timeout=3)
+    assert session.calls == [(url, session.calls[0][1], 3)]
+    assert session.calls[0][1]["Accept"] == feedparser.http.ACCEPT_HEADER
+    assert result.status == 200
+    assert result.feed.title == "Example"
+
+
+def test_default_timeout(monkeypatch):
+    session = StandInSession(feed_xml)
+    monkeypatch.setattr(feedparser.http, "TIMEOUT", 42)
+    feedparser.parse("http://127.0.0.1:8097/timeout.xml", session=session)
+    assert session.calls[0][2] == 42
+
+
+def test_default_session_is_reused(monkeypatch):
+    monkeypatch.setattr(feedparser.http, "_session", None)
+    session = feedparser.http.get_session()
+    assert feedparser.http.get_session() is session
+
+    feedparser.http.set_session(None)
+    assert feedparser.http.get_session() is not session
+
+
+def test_set_default_session(monkeypatch):
+    monkeypatch.setattr(feedparser.http, "_session", None)
+    session = StandInSession(feed_xml)
+    feedparser.http.set_session(session)
+    result = feedparser.parse("http://127.0.0.1:8097/default-session.xml")
+    assert len(session.calls) == 1
+    assert result.feed.title == "Example"
+
+
+def test_default_session_keeps_no_cookies(monkeypatch):
+    monkeypatch.setattr(feedparser.http, "_session", None)
+    url = "http://127.0.0.1:8097/cookies.xml"
+    other_url = "http://127.0.0.1:8097/cookies-other.xml"
+    responses.get(
+        url,
+        body=feed_xml,
+        content_type="application/rss+xml",
+        headers={"Set-Cookie": "session=secret; Path=/"},
+    )
+    responses.get(other_url, body=feed_xml, content_type="application/rss+xml")
+    feedparser.parse(url)
+    feedparser.parse(other_url)
+    assert "Cookie" not in responses.calls[-1].request.headers
+    assert len(feedparser.http.get_session().cookies) == 0
+
+
+def test_create_session_pool_sizes():
+    session = feedparser.http.create_session(pool_connections=3, pool_maxsize=7)
+    adapter = session.get_adapter("https://example.com/")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+
+
+def test_body_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(feedparser.http, "CHUNK_SIZE", 7)
+    monkeypatch.setattr(feedparser.http, "SPOOL_MAX_SIZE", 10)
+    session = StandInSession(feed_xml)
+    result = {}
+    url = "http://127.0.0.1:8097/x.xml"
+    with feedparser.http.get(url, result, session=session) as file:
+        assert file.read() == feed_xml
+    assert session.response.closed
+    assert result["status"] == 200
+
+
+def test_gzip_body_is_decompressed():
+    url = "http://127.0.0.1:8097/gzip.xml"
+    responses.get(
+        url,
+        body=gzip.compress(feed_xml),
+        headers={"Content-Encoding": "gzip"},
+        content_type="application/rss+xml",
+    )
+    result = feedparser.parse(url)
+    assert result.bozo is False
+    assert result.feed.title == "Example"
+
+
+def test_max_bytes_applies_to_decompressed_body():
+    url = "http://127.0.0.1:8097/bomb.xml"
+    body = feed_xml + b" " * 2**20
+    responses.get(
+        url,
+        body=gzip.compress(body),
+        headers={"Content-Encoding": "gzip"},
+        content_type="application/rss+xml",
+    )
+    result = feedparser.parse(url, max_bytes=len(body) - 1)
+    assert result.bozo is True
+    assert isinstance(result.bozo_exception, feedparser.ContentTooLarge)
+    assert result.status == 200
+    assert "title" not in result.feed
+
+
+def test_max_bytes_closes_the_response():
+    session = StandInSession(feed_xml)
+    with pytest.raises(feedparser.ContentTooLarge):
+        url = "http://127.0.0.1:8097/x.xml"
+        feedparser.http.get(url, {}, session=session, max_bytes=8)
+    assert session.response.closed
+
+
+def test_max_bytes_allows_smaller_body():
+    session = StandInSession(feed_xml)
+    result = feedparser.parse(
+        "http://127.0.0.1:8097/x.xml", session=session, max_bytes=len(feed_xml)
+    )
+    assert result.bozo is False
+    assert result.feed.title == "Example"
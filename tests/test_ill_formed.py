@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime
+import io
 import pathlib
 import typing
 
@@ -46,3 +47,53 @@ def test_http_conditions(info):
     assert result["bozo"] is True
     assert eval(eval_string, {"datetime": datetime}, result), description
     assert everything_is_unicode(result)
+
+
+@pytest.mark.parametrize("driver", ["xml.sax.expatreader", "feedparser.parsers.expat"])
+def test_strict_parser_progress_is_salvaged(driver, monkeypatch):
+    monkeypatch.setattr(feedparser.api, "PREFERRED_XML_PARSERS", [driver])
+    text = pathlib.Path("tests/illformed/rss_error_after_entries.xml").read_text()
+    fed = []
+    feed_chunk = feedparser.api.LooseFeedParser.feed_chunk
+    monkeypatch.setattr(
+        feedparser.api.LooseFeedParser,
+        "feed_chunk",
+        lambda self, data: fed.append(data) or feed_chunk(self, data),
+    )
+
+    result = feedparser.parse(text)
+    assert [entry.title for entry in result.entries] == ["one", "two", "three"]
+    assert result.feed.subtitle == "between"
+    # The loose parser reads the channel, and then resumes at the last entry.
+    fed_text = "".join(fed)
+    assert "<title>feed</title>" in fed_text
+    assert "<title>one</title>" not in fed_text
+    assert "<title>two</title>" not in fed_text
+    assert "<title>three</title>" in fed_text
+
+
+def test_salvaged_feed_lists_are_merged():
+    text = """<rss version="2.0"><channel>
+        <title>feed</title>
+        <category>before</category>
+        <item><title>one</title></item>
+        <category>between</category>
+        <link>http://example.com/</link>
+        <item><title>two</title></item>
+        <item><title>three</title></item>
+        <category>after</category>
+    </channel></rss"""
+    result = feedparser.parse(text)
+    assert result.bozo
+    assert [tag.term for tag in result.feed.tags] == ["before", "between", "after"]
+    assert result.feed.link == "http://example.com/"
+    assert result.feed == feedparser.parse(text + ">").feed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 1024])
+@pytest.mark.parametrize("newline", ["\n", "\r", "\r\n"])
+def test_read_text_skips_between_positions(size, newline):
+    text = newline.join(["ab", "cdé", "", "fgh", "ij"])
+    stream = io.StringIO(text, newline="")
+    chunks = feedparser.api._read_text(stream, size, ((2, 1), (4, 2)))
+    assert "".join(chunks) == newline.join(["ab", "c"]) + "h" + newline + "ij"
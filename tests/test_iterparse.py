@@ -0,0 +1,86 @@
+import gc
+import io
+import pathlib
+import weakref
+
+import pytest
+
+import feedparser
+
+feed_xml = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+    <channel>
+        <title>Example</title>
+        <item><title>1</title><description>one</description></item>
+        <item><title>2</title><description>two</description></item>
+        <item><title>3</title><description>three</description></item>
+        <description>after the entries</description>
+    </channel>
+</rss>
+"""
+
+paths = sorted(
+    str(path)
+    for directory in ("wellformed", "illformed")
+    for path in pathlib.Path(__file__).parent.joinpath(directory).glob("**/*.xml")
+)
+
+
+def test_metadata_first_then_entries(monkeypatch):
+    monkeypatch.setattr(feedparser.api, "ITERPARSE_CHUNK_SIZE", 16)
+    iterator = feedparser.iterparse(io.BytesIO(feed_xml))
+    result = next(iterator)
+    assert result.feed.title == "Example"
+    assert result.entries == []
+    assert [entry.title for entry in iterator] == ["1", "2", "3"]
+    # The result is updated until the iterator is exhausted.
+    assert result.feed.description == "after the entries"
+    assert result.bozo is False
+
+
+def test_loose_parser(use_loose_parser):
+    result, *entries = feedparser.iterparse(io.BytesIO(feed_xml))
+    assert result.feed.title == "Example"
+    assert [entry.title for entry in entries] == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize("chunk_size", [16, 2**14])
+def test_strict_parser_progress_is_salvaged(monkeypatch, chunk_size):
+    monkeypatch.setattr(feedparser.api, "ITERPARSE_CHUNK_SIZE", chunk_size)
+    broken_xml = feed_xml.replace(b"</rss>", b"</rss")
+    result, *entries = feedparser.iterparse(io.BytesIO(broken_xml))
+    assert result.bozo
+    assert result.feed.description == "after the entries"
+    assert [entry.title for entry in entries] == ["1", "2", "3"]
+
+
+def test_entries_are_released(monkeypatch):
+    monkeypatch.setattr(feedparser.api, "ITERPARSE_CHUNK_SIZE", 16)
+    iterator = feedparser.iterparse(io.BytesIO(feed_xml))
+    next(iterator)
+    reference = weakref.ref(next(iterator))
+    assert next(iterator).title == "2"
+    gc.collect()
+    assert reference() is None
+
+
+def test_fields():
+    result, *entries = feedparser.iterparse(io.BytesIO(feed_xml), fields={"title"})
+    assert set(result.feed) == {"title"}
+    assert [set(entry) for entry in entries] == [{"title"}] * 3
+
+
+def test_empty():
+    assert list(feedparser.iterparse(io.BytesIO(b""))) == [feedparser.parse(b"")]
+
+
+@pytest.mark.parametrize("path", paths)
+def test_same_as_parse(path):
+    expected = feedparser.parse(path)
+    result, *entries = feedparser.iterparse(path)
+    assert entries == expected.pop("entries")
+    assert result.pop("entries") == []
+    assert repr(result.pop("bozo_exception", None)) == repr(
+        expected.pop("bozo_exception", None)
+    )
+    assert result == expected
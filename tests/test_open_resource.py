@@ -1,4 +1,9 @@
+import bz2
+import gzip
 import io
+import lzma
+
+import pytest
 
 import feedparser
 
@@ -30,3 +35,180 @@ def test_unicode_2():
     s = rb"<feed><item><title>t\u00e9xt</title></item></feed>"
     r = feedparser.api._open_resource(s, {}).read()
     assert s == r
+
+
+class NonSeekableStream(io.RawIOBase):
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self.data.readinto(buffer)
+
+
+@pytest.mark.parametrize(
+    "make_source",
+    (
+        lambda data, path: data,
+        lambda data, path: io.BytesIO(data),
+        lambda data, path: NonSeekableStream(data),
+        lambda data, path: str(path),
+    ),
+    ids=("bytes", "seekable", "non-seekable", "path"),
+)
+def test_max_bytes(make_source, tmp_path):
+    s = b"<feed><item><title>text</title></item></feed>"
+    path = tmp_path / "feed.xml"
+    path.write_bytes(s)
+    r = feedparser.api._open_resource(make_source(s, path), {}, max_bytes=len(s))
+    assert r.read() == s
+    r.close()
+    with pytest.raises(feedparser.ContentTooLarge):
+        feedparser.api._open_resource(make_source(s, path), {}, max_bytes=len(s) - 1)
+
+
+def test_max_bytes_sets_bozo():
+    s = b"<rss><channel><title>x</title></channel></rss>"
+    result = feedparser.parse(s, max_bytes=10)
+    assert result.bozo is True
+    assert isinstance(result.bozo_exception, feedparser.ContentTooLarge)
+    assert result.entries == []
+
+
+@pytest.mark.parametrize(
+    "compress",
+    (gzip.compress, bz2.compress, lzma.compress),
+    ids=("gzip", "bz2", "xz"),
+)
+def test_compressed_file(compress, tmp_path):
+    s = b"<feed><item><title>text</title></item></feed>"
+    path = tmp_path / "feed.xml.compressed"
+    path.write_bytes(compress(s))
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert r.read() == s
+        r.seek(0)
+        assert r.read() == s
+
+
+def test_compressed_file_is_parsed(tmp_path):
+    path = tmp_path / "feed.xml.gz"
+    s = b"<rss><channel><title>x</title></channel></rss>"
+    path.write_bytes(gzip.compress(s))
+    result = feedparser.parse(str(path))
+    assert result.bozo is False
+    assert result.feed.title == "x"
+
+
+@pytest.mark.parametrize("size", (1000, 1001))
+def test_compressed_file_max_bytes(size, tmp_path):
+    s = b"x" * size
+    path = tmp_path / "feed.xml.gz"
+    path.write_bytes(gzip.compress(s))
+    if size > 1000:
+        with pytest.raises(feedparser.ContentTooLarge):
+            feedparser.api._open_resource(str(path), {}, max_bytes=1000)
+    else:
+        with feedparser.api._open_resource(str(path), {}, max_bytes=1000) as r:
+            assert r.read() == s
+
+
+def test_decompression_bomb_fails_fast(monkeypatch, tmp_path):
+    positions = []
+
+    class RecordingGzipFile(gzip.GzipFile):
+        def read(self, size=-1):
+            data = super().read(size)
+            positions.append(self.tell())
+            return data
+
+        def seek(self, offset, whence=io.SEEK_SET):
+            position = super().seek(offset, whence)
+            positions.append(position)
+            return position
+
+    monkeypatch.setattr(
+        feedparser.api, "_COMPRESSED_FILE_OPENERS", ((b"\x1f\x8b", RecordingGzipFile),)
+    )
+    path = tmp_path / "bomb.xml.gz"
+    # 64 MiB of zeros, in 64 KiB of gzip members.
+    path.write_bytes(gzip.compress(bytes(2**20)) * 64)
+    with pytest.raises(feedparser.ContentTooLarge):
+        feedparser.api._open_resource(str(path), {}, max_bytes=1000)
+    assert max(positions) < 2**16
+
+
+def _truncate(data):
+    return data[: len(data) // 2]
+
+
+def _corrupt(data):
+    data = bytearray(data)
+    middle = len(data) // 2
+    data[middle : middle + 2] = bytes(b ^ 0xFF for b in data[middle : middle + 2])
+    return bytes(data)
+
+
+@pytest.mark.parametrize("damage", (_truncate, _corrupt), ids=("truncated", "corrupt"))
+@pytest.mark.parametrize(
+    "compress",
+    (gzip.compress, bz2.compress, lzma.compress),
+    ids=("gzip", "bz2", "xz"),
+)
+def test_damaged_compressed_file(compress, damage, tmp_path):
+    s = b"<rss><channel>" + b"<item><title>x</title></item>" * 200 + b"</channel></rss>"
+    data = damage(compress(s))
+    path = tmp_path / "feed.xml.compressed"
+    path.write_bytes(data)
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert r.read() == data
+    result = feedparser.parse(str(path))
+    assert result.bozo
+    assert repr(result.bozo_exception) == repr(feedparser.parse(data).bozo_exception)
+
+
+def test_file_that_only_looks_compressed(tmp_path):
+    s = b"BZh, not actually compressed"
+    path = tmp_path / "feed.xml"
+    path.write_bytes(s)
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert r.read() == s
+
+
+def test_large_file_is_memory_mapped(monkeypatch, tmp_path):
+    monkeypatch.setattr(feedparser.api, "MMAP_THRESHOLD", 16)
+    s = b"<rss><channel><title>x</title></channel></rss>"
+    path = tmp_path / "feed.xml"
+    path.write_bytes(s)
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert isinstance(r, feedparser.api._MappedFile)
+        assert r.read() == s
+        assert r.seek(0) == 0
+    result = feedparser.parse(str(path))
+    assert result.bozo is False
+    assert result.feed.title == "x"
+
+
+def test_memory_mapped_file_reads_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr(feedparser.api, "MMAP_THRESHOLD", 16)
+    s = b"<rss>\n<channel>\n<title>x</title>\n</channel>\n</rss>"
+    path = tmp_path / "feed.xml"
+    path.write_bytes(s)
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert isinstance(r, feedparser.api._MappedFile)
+        expected = io.BytesIO(s)
+        assert r.readline(3) == expected.readline(3)
+        assert r.readline(100) == expected.readline(100)
+        assert r.readlines(10) == expected.readlines(10)
+        assert list(r) == list(expected)
+        r.seek(0)
+        assert r.readlines() == s.splitlines(keepends=True)
+
+
+def test_empty_file_is_not_memory_mapped(monkeypatch, tmp_path):
+    monkeypatch.setattr(feedparser.api, "MMAP_THRESHOLD", 0)
+    path = tmp_path / "feed.xml"
+    path.write_bytes(b"")
+    with feedparser.api._open_resource(str(path), {}) as r:
+        assert not isinstance(r, feedparser.api._MappedFile)
@@ -0,0 +1,54 @@
+import pathlib
+import xml.sax
+
+import pytest
+
+import feedparser
+
+feed_xml = b"""<rss version="2.0"><channel><title>%d</title></channel></rss>"""
+
+
+@pytest.mark.parametrize("chunksize", (1, 3))
+def test_parse_many(chunksize):
+    sources = [feed_xml % i for i in range(7)]
+    results = dict(feedparser.parse_many(sources, workers=2, chunksize=chunksize))
+    assert len(results) == len(sources)
+    for i, source in enumerate(sources):
+        assert results[source].feed.title == str(i)
+
+
+def test_parse_many_paths():
+    paths = sorted(str(path) for path in pathlib.Path("tests/illformed").glob("*.xml"))
+    paths = paths[:10]
+    results = dict(feedparser.parse_many(paths, workers=2, chunksize=4))
+    for path in paths:
+        expected = feedparser.parse(path)
+        assert results[path].bozo == expected.bozo
+        assert results[path].entries == expected.entries
+        if expected.bozo:
+            exception = results[path].bozo_exception
+            assert type(exception) is type(expected.bozo_exception)
+            assert str(exception) == str(expected.bozo_exception)
+
+
+def test_parse_many_sax_exception_is_preserved():
+    source = b"<rss version='2.0'><channel><title>&foo;</title></channel>"
+    expected = feedparser.parse(source).bozo_exception
+    [(_, result)] = feedparser.parse_many([source], workers=1)
+    assert isinstance(result.bozo_exception, xml.sax.SAXParseException)
+    assert result.bozo_exception.getLineNumber() == expected.getLineNumber()
+    assert result.bozo_exception.getColumnNumber() == expected.getColumnNumber()
+
+
+def test_parse_many_exceptions_per_item():
+    sources = [feed_xml % 1, 12345, feed_xml % 2]
+    results = list(feedparser.parse_many(sources, workers=1, chunksize=3))
+    assert [source for source, _ in results] == sources
+    assert results[0][1].feed.title == "1"
+    assert isinstance(results[1][1], Exception)
+    assert results[2][1].feed.title == "2"
+
+
+def test_parse_many_invalid_chunksize():
+    with pytest.raises(ValueError):
+        list(feedparser.parse_many([], chunksize=0))
@@ -114,3 +114,113 @@ def test_optimistic_encoding_detection(get_content, kwargs):
     result = feedparser.parse(content, **kwargs)
     assert len(result.entries), result
     assert result.entries[0].description == description
+
+
+many_entries_xml = b"""
+    <rss version="2.0">
+        <channel>
+            <title>Example</title>
+            <item><title>1</title></item>
+            <item><title>2</title></item>
+            <item><title>3</title></item>
+            <description>after the entries</description>
+        </channel>
+    </rss>
+"""
+
+
+@pytest.mark.parametrize(
+    "max_entries, titles, truncated",
+    (
+        (0, [], True),
+        (2, ["1", "2"], True),
+        (3, ["1", "2", "3"], False),
+        (4, ["1", "2", "3"], False),
+    ),
+)
+def test_max_entries(max_entries, titles, truncated):
+    d = feedparser.parse(io.BytesIO(many_entries_xml), max_entries=max_entries)
+    assert d.bozo is False
+    assert d.feed.title == "Example"
+    assert [entry.title for entry in d.entries] == titles
+    assert d.truncated is truncated
+
+
+def test_max_entries_loose(use_loose_parser):
+    d = feedparser.parse(io.BytesIO(many_entries_xml), max_entries=1)
+    assert d.feed.title == "Example"
+    assert [entry.title for entry in d.entries] == ["1"]
+    assert d.truncated is True
+
+
+def test_max_entries_json():
+    data = b"""{
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": "Example",
+        "items": [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+    }"""
+    d = feedparser.parse(
+        io.BytesIO(data),
+        response_headers={"content-type": "application/feed+json"},
+        max_entries=2,
+    )
+    assert [entry.id for entry in d.entries] == ["1", "2"]
+    assert d.truncated is True
+
+
+def test_negative_max_entries():
+    with pytest.raises(ValueError):
+        feedparser.parse(io.BytesIO(many_entries_xml), max_entries=-1)
+
+
+def test_max_entries_default():
+    d = feedparser.parse(io.BytesIO(many_entries_xml))
+    assert len(d.entries) == 3
+    assert d.feed.description == "after the entries"
+    assert "truncated" not in d
+
+
+projection_xml = b"""
+    <rss version="2.0">
+        <channel>
+            <title>Example</title>
+            <description>A <b>feed</b></description>
+            <item>
+                <title>1</title>
+                <link>https://example.com/1</link>
+                <pubDate>Sat, 07 Sep 2002 00:00:01 GMT</pubDate>
+                <description>&lt;script&gt;alert(1)&lt;/script&gt;</description>
+            </item>
+        </channel>
+    </rss>
+"""
+
+
+def test_fields():
+    d = feedparser.parse(
+        io.BytesIO(projection_xml), fields={"title", "link", "published_parsed"}
+    )
+    assert set(d.feed) == {"title"}
+    assert set(d.entries[0]) == {"title", "link", "published_parsed"}
+    assert d.entries[0].published_parsed[:3] == (2002, 9, 7)
+
+
+def test_fields_skips_unrequested_elements(monkeypatch):
+    calls = []
+
+    def record(value, *args):
+        if value:
+            calls.append(value)
+
+    monkeypatch.setattr(feedparser.mixin, "sanitize_html", record)
+    monkeypatch.setattr(feedparser.namespaces._base, "_parse_date", record)
+    d = feedparser.parse(io.BytesIO(projection_xml), fields={"link"})
+    assert d.entries[0].link == "https://example.com/1"
+    assert calls == []
+
+
+def test_fields_aliases():
+    d = feedparser.parse(io.BytesIO(projection_xml), fields={"description"})
+    assert d.feed.description == "A <b>feed</b>"
+    assert d.entries[0].description == ""
+    assert "title" not in d.entries[0]
@@ -0,0 +1,116 @@
+import threading
+import xml.sax
+
+import pytest
+
+import feedparser
+import feedparser.api
+import feedparser.parsers.expat
+
+feed_xml = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <channel>
+        <title>one</title>
+        <item><title>a</title><dc:creator>someone</dc:creator></item>
+        <item><title>b</title></item>
+    </channel>
+</rss>
+"""
+
+other_feed_xml = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="de">
+    <title>two</title>
+    <entry><title>c</title></entry>
+</feed>
+"""
+
+
+@pytest.fixture
+def make_parser_calls(monkeypatch):
+    pool = feedparser.api._SAXParserPool()
+    monkeypatch.setattr(feedparser.api, "_sax_parser_pool", pool)
+    calls = []
+    make_parser = xml.sax.make_parser
+
+    def wrapper(*args):
+        calls.append(args)
+        return make_parser(*args)
+
+    monkeypatch.setattr(xml.sax, "make_parser", wrapper)
+    return calls
+
+
+def test_sax_parser_is_reused(make_parser_calls):
+    feedparser.parse(feed_xml)
+    feedparser.parse(other_feed_xml)
+    list(feedparser.iterparse(feed_xml))
+    assert len(make_parser_calls) == 1
+
+
+def test_reused_sax_parser_starts_over(make_parser_calls):
+    first = feedparser.parse(feed_xml)
+    second = feedparser.parse(other_feed_xml)
+    assert len(make_parser_calls) == 1
+
+    assert first == feedparser.parse(feed_xml)
+    assert first.feed.title == "one"
+    assert [entry.title for entry in first.entries] == ["a", "b"]
+    assert second.feed.title == "two"
+    assert second.feed.language == "de"
+    assert [entry.title for entry in second.entries] == ["c"]
+    assert "dc" not in second.namespaces
+    assert second.version == "atom10"
+
+
+def test_sax_parser_is_not_shared_between_threads(make_parser_calls):
+    feedparser.parse(feed_xml)
+    thread = threading.Thread(target=feedparser.parse, args=(feed_xml,))
+    thread.start()
+    thread.join()
+    assert len(make_parser_calls) == 2
+
+
+def test_unfinished_sax_parser_is_not_reused(make_parser_calls):
+    result = feedparser.parse(feed_xml, max_entries=1)
+    assert result.truncated
+    feedparser.parse(other_feed_xml)
+    assert len(make_parser_calls) == 2
+
+
+def test_sax_parser_pool_size(make_parser_calls, monkeypatch):
+    monkeypatch.setattr(feedparser.api, "SAX_PARSER_POOL_SIZE", 0)
+    feedparser.parse(feed_xml)
+    feedparser.parse(feed_xml)
+    assert len(make_parser_calls) == 2
+
+
+def test_strict_feed_parser_reset():
+    feed_parser = feedparser.api.StrictFeedParser("http://example.com/", "en", "utf-8")
+    feed_parser.feeddata["title"] = "one"
+    feed_parser.entries.append({})
+    feeddata = feed_parser.feeddata
+
+    feed_parser.reset("http://example.org/", None, "utf-8")
+    assert feed_parser.baseuri == "http://example.org/"
+    assert feed_parser.lang is None
+    assert feed_parser.feeddata == {}
+    assert feed_parser.entries == []
+    assert feeddata == {"language": "en", "title": "one"}
+
+
+def test_expat_driver_reports_text_once(make_parser_calls, use_expat_driver):
+    data = b"<rss><channel><title>a\nb &amp; c</title></channel></rss>"
+    text = []
+    characters = feedparser.api.StrictFeedParser.characters
+
+    def collect(self, data):
+        text.append(data)
+        characters(self, data)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(feedparser.api.StrictFeedParser, "characters", collect)
+        result = feedparser.parse(data)
+    assert result.feed.title == "a\nb & c"
+    assert text == ["a\nb & c"]
+    (saxparser, _, _), *_ = feedparser.api._sax_parser_pool.idle
+    assert isinstance(saxparser, feedparser.parsers.expat.ExpatReader)
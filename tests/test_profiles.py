@@ -0,0 +1,115 @@
+import pytest
+import responses
+
+import feedparser
+import feedparser.api
+import feedparser.encodings
+
+feed_xml = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+    <channel>
+        <title>Caf\xe9</title>
+        <item><pubDate>Thu, 01 Jan 2004 19:48:21 GMT</pubDate></item>
+    </channel>
+</rss>
+"""
+
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    calls = {}
+
+    def count(module, name):
+        original = getattr(module, name)
+
+        def wrapper(*args, **kwargs):
+            calls[name] = calls.get(name, 0) + 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(module, name, wrapper)
+
+    count(feedparser.encodings, "convert_to_utf8")
+    yield calls
+
+
+def test_encoding_is_remembered(count_calls):
+    url = "http://127.0.0.1:8097/profile-encoding.xml"
+    # Only the prefix of a large feed is used to detect its encoding.
+    padding = b"<description>" + b"x" * 2**16 + b"</description>"
+    large_xml = feed_xml.replace(b"</channel>", padding + b"</channel>")
+    responses.get(url, body=large_xml, content_type="application/rss+xml")
+    profiles = feedparser.ProfileCache()
+
+    first = feedparser.parse(url, profiles=profiles)
+    calls_without_hint = count_calls.pop("convert_to_utf8")
+    second = feedparser.parse(url, profiles=profiles)
+    assert count_calls["convert_to_utf8"] < calls_without_hint
+    assert repr(second.pop("bozo_exception")) == repr(first.pop("bozo_exception"))
+    assert second == first
+    assert second.encoding == "windows-1252"
+    assert second.feed.title == "Caf\xe9"
+
+
+def test_dates_are_parsed_as_without_a_profile():
+    url = "http://127.0.0.1:8097/profile-date.xml"
+    dates_xml = b"""<rss version="2.0"><channel>
+        <item><pubDate>2004-07-08 23:56:58</pubDate></item>
+        <item><pubDate>2003</pubDate></item>
+        <item><pubDate>20040708</pubDate></item>
+    </channel></rss>"""
+    responses.get(url, body=dates_xml, content_type="application/rss+xml")
+    profiles = feedparser.ProfileCache()
+    expected = feedparser.parse(dates_xml)
+    for _ in range(2):
+        result = feedparser.parse(url, profiles=profiles)
+        assert result.entries == expected.entries
+
+
+def test_hints_are_revalidated(count_calls):
+    url = "http://127.0.0.1:8097/profile-revalidate.xml"
+    padding = b"<description>" + b"x" * 2**16 + b"</description>"
+    large_xml = feed_xml.replace(b"</channel>", padding + b"</channel>")
+    responses.get(url, body=large_xml, content_type="application/rss+xml")
+    profiles = feedparser.ProfileCache(revalidate_every=2)
+
+    calls = []
+    for _ in range(4):
+        feedparser.parse(url, profiles=profiles)
+        calls.append(count_calls.pop("convert_to_utf8"))
+    # The hints are ignored the first time, and then every second time.
+    assert calls[0] == calls[2] > calls[1] == calls[3]
+
+
+def test_cache_is_bounded():
+    profiles = feedparser.ProfileCache(maxsize=2)
+    for name in ("a", "b", "c"):
+        url = f"http://127.0.0.1:8097/profile-{name}.xml"
+        responses.get(url, body=feed_xml, content_type="application/rss+xml")
+        feedparser.parse(url, profiles=profiles)
+    assert len(profiles) == 2
+    assert "http://127.0.0.1:8097/profile-a.xml" not in profiles
+    assert "http://127.0.0.1:8097/profile-c.xml" in profiles
+
+
+def test_only_urls_are_remembered():
+    profiles = feedparser.ProfileCache()
+    feedparser.parse(feed_xml, profiles=profiles)
+    assert len(profiles) == 0
+
+
+def test_iterparse():
+    url = "http://127.0.0.1:8097/profile-iterparse.xml"
+    responses.get(url, body=feed_xml, content_type="application/rss+xml")
+    profiles = feedparser.ProfileCache()
+    first, *first_entries = feedparser.iterparse(url, profiles=profiles)
+    assert url in profiles
+    second, *second_entries = feedparser.iterparse(url, profiles=profiles)
+    assert repr(second.pop("bozo_exception")) == repr(first.pop("bozo_exception"))
+    assert second == first
+    assert second_entries == first_entries
+
+
+@pytest.mark.parametrize("argument", ["maxsize", "revalidate_every"])
+def test_invalid_arguments(argument):
+    with pytest.raises(ValueError):
+        feedparser.ProfileCache(**{argument: 0})
@@ -1,4 +1,9 @@
+import pytest
+
+import feedparser
+import feedparser.html
 import feedparser.sanitizer
+import feedparser.urls
 
 
 def test_style_attr_is_enabled():
@@ -15,3 +20,215 @@ def test_style_attr_can_be_disabled():
     result = feedparser.sanitizer.sanitize_html(html, None, "text/html")
     feedparser.sanitizer.HTMLSanitizer.acceptable_attributes = original_attrs
     assert result == expected
+
+
+def test_sanitizer_can_be_fed_in_chunks():
+    html = (
+        '<p title="&#39;x&#34;">AT&T &#x26; <br/><img src="a.png"/></p>'
+        "<!-- comment --><!foo><b>bold</b><!-- unclosed"
+    )
+    expected = feedparser.sanitizer.sanitize_html(html, None, "text/html")
+    sanitizer = feedparser.sanitizer.HTMLSanitizer(None, "text/html")
+    for i in range(len(html)):
+        sanitizer.feed_chunk(html[i])
+    sanitizer.close()
+    assert sanitizer.output().strip() == expected
+
+
+@pytest.mark.parametrize(
+    "html",
+    (
+        '<a href="/a">x</a><img src="b.png"/><br>',
+        "<p>AT&T &foo; &amp; &#39; &#x26;</p>",
+        "<script>&foo; <b>x</b></script>&bar;",
+        '<img/src="z"/><a href="/c">c</a>',
+        "<p>&</embed>amp; x</p>",
+        "<![CDATA[<a href='/d'>]]>",
+        '<a href="/e">e</a><!-- unclosed',
+    ),
+)
+@pytest.mark.parametrize("content_type", ("text/html", "application/xhtml+xml"))
+def test_sanitizing_resolves_relative_uris(html, content_type):
+    base_uri = "http://example.com/a/b"
+    resolved = feedparser.urls.resolve_relative_uris(html, base_uri, None, content_type)
+    expected = feedparser.sanitizer.sanitize_html(resolved, None, content_type)
+    result = feedparser.sanitizer.sanitize_html(html, None, content_type, base_uri)
+    assert result == expected
+
+
+def test_sanitizing_resolves_relative_uris_in_one_parse(monkeypatch):
+    parsers = []
+    original_init = feedparser.html.BaseHTMLProcessor.__init__
+
+    def init(self, *args):
+        parsers.append(type(self))
+        original_init(self, *args)
+
+    monkeypatch.setattr(feedparser.html.BaseHTMLProcessor, "__init__", init)
+    result = feedparser.parse(
+        '<rss><channel><item><description>&lt;a href="/x"&gt;x&lt;/a&gt;'
+        "</description></item></channel></rss>",
+        response_headers={"content-location": "http://example.com/"},
+    )
+    assert result.entries[0].summary == '<a href="http://example.com/x">x</a>'
+    assert len(parsers) == 1
+
+
+@pytest.mark.parametrize(
+    "style, expected",
+    (
+        ("color: red; margin: 0 auto", "color: red; margin: 0 auto;"),
+        ("background: url(x.png) red;", "background: red;"),
+        ("border: 1px solid expression(alert(1))", ""),
+        ("color: red; : ; width: 1px", ""),
+        ("color: red;\n  fill: blue; ", "color: red;"),
+        ("font: x; margin: 1px bogus", "font: x;"),
+    ),
+)
+def test_sanitize_style(style, expected):
+    sanitizer = feedparser.sanitizer.HTMLSanitizer()
+    assert sanitizer.sanitize_style(style) == expected
+    # The second time, the remembered result is used.
+    assert sanitizer.sanitize_style(style) == expected
+
+
+def test_sanitized_styles_depend_on_the_context():
+    class NoColorSanitizer(feedparser.sanitizer.HTMLSanitizer):
+        acceptable_css_properties = {"width"}
+
+    sanitizer = feedparser.sanitizer.HTMLSanitizer()
+    style = "color: red; fill: blue"
+    assert sanitizer.sanitize_style(style) == "color: red;"
+    sanitizer.svgOK = 1
+    assert sanitizer.sanitize_style(style) == "color: red; fill: blue;"
+    assert NoColorSanitizer().sanitize_style(style) == ""
+
+
+def test_sanitized_styles_are_remembered_up_to_a_limit(monkeypatch):
+    monkeypatch.setattr(feedparser.sanitizer, "STYLE_CACHE_SIZE", 2)
+    monkeypatch.setattr(feedparser.sanitizer, "_clean_styles", {})
+    sanitizer = feedparser.sanitizer.HTMLSanitizer()
+    for width in range(5):
+        sanitizer.sanitize_style(f"width: {width}px")
+        assert len(feedparser.sanitizer._clean_styles) <= 2
+    assert sanitizer.sanitize_style("width: 4px") == "width: 4px;"
+
+
+def test_policy_is_immutable():
+    policy = feedparser.SanitizerPolicy()
+    assert "a" in policy.acceptable_elements
+    with pytest.raises(AttributeError):
+        policy.acceptable_elements = frozenset()
+    with pytest.raises(AttributeError):
+        policy.acceptable_elements.add("script")
+    with pytest.raises(TypeError):
+        policy.svg_elem_map["script"] = "script"
+    with pytest.raises(TypeError):
+        feedparser.SanitizerPolicy(acceptable_tags={"a"})
+    assert not hasattr(policy, "__dict__")
+
+
+def test_policy_restores_svg_case():
+    policy = feedparser.SanitizerPolicy()
+    assert "lineargradient" in policy.svg_elements
+    assert policy.svg_elem_map["lineargradient"] == "linearGradient"
+    assert policy.svg_attr_map["viewbox"] == "viewBox"
+    html = '<svg viewBox="0 0 1 1"><linearGradient id="g"></linearGradient></svg>'
+    result = feedparser.sanitizer.sanitize_html(html, None, "text/html", policy=policy)
+    assert result == (
+        '<svg viewBox="0 0 1 1" xmlns="http://www.w3.org/2000/svg">'
+        '<linearGradient id="g"></linearGradient></svg>'
+    )
+
+
+def test_default_policy_follows_in_place_changes():
+    default_elements = feedparser.sanitizer.HTMLSanitizer.acceptable_elements
+
+    class Sanitizer(feedparser.sanitizer.HTMLSanitizer):
+        acceptable_elements = set(default_elements)
+
+    def sanitize(html):
+        sanitizer = Sanitizer("utf-8", "text/html")
+        sanitizer.feed(html)
+        sanitizer.close()
+        return sanitizer.output()
+
+    assert sanitize("<b>x</b>") == "<b>x</b>"
+    # The number of names doesn't change.
+    Sanitizer.acceptable_elements.remove("b")
+    Sanitizer.acceptable_elements.add("blink")
+    assert sanitize("<b>x</b><blink>y</blink>") == "x<blink>y</blink>"
+
+
+def test_custom_policy():
+    policy = feedparser.SanitizerPolicy(
+        acceptable_elements={"p"}, acceptable_attributes={"class"}
+    )
+    html = '<p class="x" id="y"><b>bold</b></p>'
+    result = feedparser.sanitizer.sanitize_html(html, None, "text/html", policy=policy)
+    assert result == '<p class="x">bold</p>'
+    default = feedparser.sanitizer.sanitize_html(html, None, "text/html")
+    assert default == '<p class="x" id="y"><b>bold</b></p>'
+
+
+def test_custom_policy_is_passed_to_parse():
+    policy = feedparser.SanitizerPolicy(acceptable_elements={"p"})
+    cache = feedparser.SanitizerCache()
+    feed = "<rss><channel><item><description>&lt;p&gt;&lt;b&gt;x</description>"
+    feed += "</item></channel></rss>"
+    default = feedparser.parse(feed, sanitizer_cache=cache)
+    custom = feedparser.parse(feed, sanitizer_cache=cache, sanitizer_policy=policy)
+    assert default.entries[0].summary == "<p><b>x"
+    assert custom.entries[0].summary == "<p>x"
+
+
+@pytest.mark.parametrize(
+    "html",
+    (
+        "<p title='a>b' class=x>AT&T &copy &#8217; &#x41; &bogus;</p>",
+        "<a/b/ <> </> <x:y z='1'/></x:y><br/>",
+        "<p <b>x</b> < p> &#12 &",
+        "<!-- c --><!DOCTYPE html><?pi x?><![if x]><!x>",
+        "<a href='/q' title=\"&quot;&#39;\">",
+    ),
+)
+@pytest.mark.parametrize("content_type", ("text/html", "application/xhtml+xml"))
+def test_tokenizers_are_equivalent(html, content_type, monkeypatch):
+    results = []
+    for tokenizer in ("sgmllib", "scanner"):
+        monkeypatch.setattr(feedparser.html, "HTML_TOKENIZER", tokenizer)
+        resolver = feedparser.urls.RelativeURIResolver("http://e/", None, content_type)
+        for i in range(len(html)):
+            resolver.feed_chunk(html[i])
+        resolver.close()
+        results.append(
+            (
+                feedparser.sanitizer.sanitize_html(html, None, content_type),
+                resolver.output(),
+            )
+        )
+    assert results[0] == results[1]
+
+
+def test_scanner_is_not_used_with_tag_methods():
+    class Processor(feedparser.html.BaseHTMLProcessor):
+        def start_b(self, attrs):
+            self.pieces.append("<strong>")
+
+    assert feedparser.sanitizer.HTMLSanitizer._scannable
+    assert not Processor._scannable
+    processor = Processor()
+    processor.feed("<b>x")
+    assert processor.output() == "<strong>x"
+
+
+def test_scanner_needs_sgmllib_state(monkeypatch):
+    monkeypatch.setattr(feedparser.html, "_SGMLLIB_STATE_KNOWN", False)
+    assert not feedparser.sanitizer.HTMLSanitizer._can_scan()
+
+
+@pytest.mark.parametrize("html", ("<p>x</p><b", "<p>AT&amp", "<p>x</p><!-- y"))
+def test_feed_parses_the_complete_document(html):
+    processor = feedparser.html.BaseHTMLProcessor("utf-8", "text/html")
+    processor.feed(html)
+    assert processor.output() == html
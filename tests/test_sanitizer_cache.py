@@ -0,0 +1,68 @@
+import pytest
+
+import feedparser
+import feedparser.sanitizer
+
+feed_xml = """<rss version="2.0"><channel>
+    <item><description>&lt;a href="/a"&gt;a&lt;/a&gt;&lt;script&gt;</description></item>
+    <item><description>&lt;p&gt;b&lt;/p&gt;</description></item>
+</channel></rss>"""
+
+
+def test_sanitized_content_is_cached():
+    cache = feedparser.SanitizerCache()
+    headers = {"content-location": "http://example.com/"}
+    first = feedparser.parse(feed_xml, headers, sanitizer_cache=cache)
+    assert cache.info()[:3] == (0, 2, 2)
+    second = feedparser.parse(feed_xml, headers, sanitizer_cache=cache)
+    assert cache.info()[:3] == (2, 2, 2)
+    uncached = feedparser.parse(feed_xml, headers)
+    assert first.entries == second.entries == uncached.entries
+    assert second.entries[0].summary == '<a href="http://example.com/a">a</a>'
+
+
+def test_base_uri_is_part_of_the_key():
+    cache = feedparser.SanitizerCache()
+    for base in ("http://example.com/", "http://example.org/"):
+        result = feedparser.parse(
+            feed_xml, {"content-location": base}, sanitizer_cache=cache
+        )
+        assert result.entries[0].summary == f'<a href="{base}a">a</a>'
+    assert cache.info().hits == 0
+
+
+def test_least_recently_used_is_forgotten():
+    cache = feedparser.SanitizerCache(maxsize=2)
+    for html in ("<p>a</p>", "<p>b</p>", "<p>a</p>", "<p>c</p>"):
+        feedparser.sanitizer.sanitize_html(html, "utf-8", "text/html", cache=cache)
+    assert len(cache) == 2
+    assert cache.info().hits == 1
+    feedparser.sanitizer.sanitize_html("<p>a</p>", "utf-8", "text/html", cache=cache)
+    assert cache.info().hits == 2
+
+
+def test_size_in_bytes_is_bounded():
+    html = "<p>" + "x" * 1000 + "</p>"
+    cache = feedparser.SanitizerCache(maxbytes=5000)
+    for i in range(5):
+        feedparser.sanitizer.sanitize_html(
+            html + str(i), None, "text/html", cache=cache
+        )
+        assert cache.info().bytes <= 5000
+    assert len(cache) == 2
+
+    feedparser.sanitizer.sanitize_html(html * 5, None, "text/html", cache=cache)
+    assert len(cache) == 2
+
+
+def test_clear():
+    cache = feedparser.SanitizerCache()
+    feedparser.sanitizer.sanitize_html("<p>a</p>", None, "text/html", cache=cache)
+    cache.clear()
+    assert cache.info() == (0, 0, 0, cache.maxsize, 0, cache.maxbytes)
+
+
+@pytest.mark.parametrize("kwargs", ({"maxsize": 0}, {"maxbytes": 0}))
+def test_bad_limits(kwargs):
+    with pytest.raises(ValueError):
+        feedparser.SanitizerCache(**kwargs)
@@ -36,6 +36,15 @@ def test_strict_parser(info):
     assert everything_is_unicode(result)
 
 
+@pytest.mark.parametrize("info", tests)
+def test_expat_driver(info, use_expat_driver):
+    path, data, text, description, eval_string, _ = info
+    result = feedparser.parse(text)
+    assert result["bozo"] is False
+    assert eval(eval_string, {"datetime": datetime}, result), description
+    assert everything_is_unicode(result)
+
+
 @pytest.mark.parametrize("info", tests)
 def test_loose_parser(info, use_loose_parser):
     path, data, text, description, eval_string, _ = info
@@ -46,6 +55,26 @@ def test_loose_parser(info, use_loose_parser):
     assert everything_is_unicode(result)
 
 
+@pytest.mark.parametrize("info", tests)
+def test_sgmllib_tokenizer(info, use_loose_parser, use_sgmllib_tokenizer):
+    path, data, text, description, eval_string, _ = info
+
+    result = feedparser.parse(text)
+    assert result["bozo"] is False
+    assert eval(eval_string, {"datetime": datetime}, result), description
+    assert everything_is_unicode(result)
+
+
+@pytest.mark.parametrize("info", tests)
+def test_loose_parser_fed_in_chunks(info, use_loose_parser, monkeypatch):
+    path, data, text, description, eval_string, _ = info
+    monkeypatch.setattr(feedparser.api, "LOOSE_CHUNK_SIZE", 3)
+
+    result = feedparser.parse(text)
+    assert result["bozo"] is False
+    assert eval(eval_string, {"datetime": datetime}, result), description
+
+
 @pytest.mark.parametrize("info", http_tests)
 def test_http_conditions(info):
     path, data, text, url, description, eval_string, _ = info
@@ -53,3 +82,24 @@ def test_http_conditions(info):
     assert result["bozo"] is False
     assert eval(eval_string, {"datetime": datetime}, result), description
     assert everything_is_unicode(result)
+
+
+@pytest.mark.parametrize("loose", (False, True))
+def test_details_are_not_shared(loose, monkeypatch):
+    if loose:
+        monkeypatch.setattr(feedparser.api, "_XML_AVAILABLE", False)
+    entry = "<entry><title type='html'>t</title><content>c</content></entry>"
+    result = feedparser.parse(
+        f"<feed xmlns='http://www.w3.org/2005/Atom'>{entry}{entry}</feed>"
+    )
+    first, second = result.entries
+    first.title_detail["type"] = "changed"
+    first.content[0]["type"] = "changed"
+    assert isinstance(second.title_detail, feedparser.FeedParserDict)
+    assert second.title_detail == {
+        "type": "text/html",
+        "language": None,
+        "base": "",
+        "value": "t",
+    }
+    assert second.content[0]["type"] != "changed"